@@ -1,10 +1,16 @@
 import re
 import json
+import asyncio
 from config import Config
+from utils.async_loop import background_loop
 from utils.llm_manager import llm_manager
 
 def evaluate_answer_dynamically(question, answer, context=None):
     """Evaluate answer using the configured LLM provider"""
+    return background_loop.run(aevaluate_answer_dynamically(question, answer, context))
+
+async def aevaluate_answer_dynamically(question, answer, context=None):
+    """Async answer evaluation using the configured LLM provider"""
     
     # Handle skipped answers
     if "[skipped]" in answer.lower() or "[skip]" in answer.lower():
@@ -53,7 +59,7 @@ def evaluate_answer_dynamically(question, answer, context=None):
     """
 
     try:
-        evaluation_text = llm_manager.generate_response(user_prompt, system_prompt)
+        evaluation_text = await llm_manager.agenerate_response(user_prompt, system_prompt)
         
         # Clean the response to extract JSON
         evaluation_text = evaluation_text.strip()
@@ -70,23 +76,7 @@ def evaluate_answer_dynamically(question, answer, context=None):
         # Parse JSON
         evaluation = json.loads(evaluation_text)
         
-        # Validate required keys and provide defaults
-        required_keys = {
-            "score": 0,
-            "feedback": "No feedback provided",
-            "suggestions": [],
-            "confidence": "Medium",
-            "strengths": [],
-            "weaknesses": [],
-            "followup_questions": []
-        }
-        
-        for key, default_value in required_keys.items():
-            if key not in evaluation:
-                evaluation[key] = default_value
-        
-        # Ensure score is within valid range
-        evaluation["score"] = max(0, min(100, int(evaluation["score"])))
+        evaluation = _normalize_evaluation(evaluation)
         
         print(f"✅ Answer evaluated successfully - Score: {evaluation['score']}%")
         return evaluation
@@ -156,46 +146,98 @@ def parse_text_evaluation(text):
         result["feedback"] = "Could not parse evaluation response"
         return result
 
+def _normalize_evaluation(evaluation):
+    """Validate required keys, provide defaults and clamp the score"""
+    required_keys = {
+        "score": 0,
+        "feedback": "No feedback provided",
+        "suggestions": [],
+        "confidence": "Medium",
+        "strengths": [],
+        "weaknesses": [],
+        "followup_questions": []
+    }
+    
+    for key, default_value in required_keys.items():
+        if key not in evaluation:
+            evaluation[key] = default_value
+    
+    # Ensure score is within valid range
+    evaluation["score"] = max(0, min(100, int(evaluation["score"])))
+    return evaluation
+
 def evaluate_answers_batch(qa_pairs):
     """Batch evaluation for efficiency"""
+    return background_loop.run(aevaluate_answers_batch(qa_pairs))
+
+async def aevaluate_answers_batch(qa_pairs):
+    """Evaluate several answers (possibly from different interviews) in one LLM call
+
+    Results are matched back by question_index, the position in qa_pairs. Items missing
+    from the batched response, or all items if it cannot be parsed, are evaluated one by one.
+    """
     if len(qa_pairs) <= 1:
         # For single questions, use individual evaluation
-        return [evaluate_answer_dynamically(pair['question'], pair['answer']) for pair in qa_pairs]
+        return [await aevaluate_answer_dynamically(pair['question'], pair['answer']) for pair in qa_pairs]
     
     system_prompt = """You are an efficient batch evaluator. Evaluate multiple interview answers 
-    and return results in JSON format."""
+    independently of each other and return results in JSON format."""
     
-    combined_prompt = "Evaluate these interview answers:\n\n"
+    combined_prompt = "Evaluate these interview answers. Each one is unrelated to the others:\n\n"
     for i, pair in enumerate(qa_pairs):
-        combined_prompt += f"QUESTION {i+1}: {pair['question']}\n"
+        combined_prompt += f"QUESTION_INDEX {i}\n"
+        combined_prompt += f"QUESTION: {pair['question']}\n"
         combined_prompt += f"ANSWER: {pair['answer']}\n\n"
     
     combined_prompt += """
+    Score each answer on relevance (0-30), technical accuracy (0-30), depth (0-20) and clarity (0-20).
+    
     Provide evaluations in JSON format as a list of objects with:
-    - question_index (starting from 0)
+    - question_index (the QUESTION_INDEX given above)
     - score (0-100)
     - feedback (brief, 1-2 sentences)
     - suggestions (list of 1-2 items)
     - confidence (High/Medium/Low)
+    - strengths (list of 1-2 items)
+    - weaknesses (list of 1-2 items)
     
-    Return only valid JSON array format.
+    Return only valid JSON array format with exactly one object per QUESTION_INDEX.
     """
     
+    by_index = {}
     try:
-        response_text = llm_manager.generate_response(combined_prompt, system_prompt)
+        response_text = await llm_manager.agenerate_response(combined_prompt, system_prompt)
         
         # Clean and parse JSON
         response_text = re.sub(r'^```json\n?|\n?```$', '', response_text.strip(), flags=re.MULTILINE)
+        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+        if json_match:
+            response_text = json_match.group()
         evaluations = json.loads(response_text)
         
-        # Validate and fill missing data
-        for i, evaluation in enumerate(evaluations):
+        # Demultiplex by question_index
+        for evaluation in evaluations:
             if not isinstance(evaluation, dict):
-                evaluations[i] = evaluate_answer_dynamically(qa_pairs[i]['question'], qa_pairs[i]['answer'])
-        
-        return evaluations
+                continue
+            try:
+                index = int(evaluation.pop('question_index'))
+                if 0 <= index < len(qa_pairs) and index not in by_index:
+                    by_index[index] = _normalize_evaluation(evaluation)
+            except (KeyError, TypeError, ValueError):
+                continue
         
     except Exception as e:
         print(f"❌ Batch evaluation failed: {e}")
-        # Fallback to individual evaluation
-        return [evaluate_answer_dynamically(pair['question'], pair['answer']) for pair in qa_pairs]
+    
+    missing = [i for i in range(len(qa_pairs)) if i not in by_index]
+    if missing:
+        # Fallback to individual evaluation for anything the batch did not cover
+        print(f"⚠️ Batch response missing {len(missing)}/{len(qa_pairs)} evaluations, evaluating individually")
+        fallbacks = await asyncio.gather(*[
+            aevaluate_answer_dynamically(qa_pairs[i]['question'], qa_pairs[i]['answer']) for i in missing
+        ])
+        by_index.update(zip(missing, fallbacks))
+    else:
+        print(f"✅ Batch of {len(qa_pairs)} answers evaluated in one request")
+    
+    return [by_index[i] for i in range(len(qa_pairs))]
@@ -1,12 +1,60 @@
 from config import Config
+from utils.async_loop import background_loop
 from utils.llm_manager import llm_manager
+from utils.evaluation_queue import is_pending
 
 def generate_final_feedback(full_qa_evaluations, answered_count, total_questions):
     """Generate final feedback using the configured LLM provider"""
+    return background_loop.run(agenerate_final_feedback(full_qa_evaluations, answered_count, total_questions))
+
+async def agenerate_final_feedback(full_qa_evaluations, answered_count, total_questions):
+    """Async final feedback generation using the configured LLM provider"""
     
     if not full_qa_evaluations:
         return "No answers were provided during the interview."
     
+    system_prompt, user_prompt, summary = _build_feedback_request(full_qa_evaluations, answered_count, total_questions)
+
+    try:
+        final_report = await llm_manager.agenerate_response(user_prompt, system_prompt)
+        print("✅ Final report generated successfully")
+        return final_report
+        
+    except Exception as e:
+        error_msg = f"Report generation failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        return _fallback_report(summary, error_msg)
+
+def stream_final_feedback(full_qa_evaluations, answered_count, total_questions):
+    """Yield the final report as markdown chunks while the LLM generates it
+
+    If generation fails the error is re-raised (after a basic fallback report when nothing
+    was streamed yet), so callers never mistake partial output for a complete report.
+    """
+    
+    if not full_qa_evaluations:
+        yield "No answers were provided during the interview."
+        return
+    
+    system_prompt, user_prompt, summary = _build_feedback_request(full_qa_evaluations, answered_count, total_questions)
+
+    streamed_any = False
+    try:
+        for chunk in llm_manager.stream_response(user_prompt, system_prompt):
+            streamed_any = True
+            yield chunk
+        print("✅ Final report streamed successfully")
+        
+    except Exception as e:
+        error_msg = f"Report generation failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        if not streamed_any:
+            yield _fallback_report(summary, error_msg)
+        raise
+
+def _build_feedback_request(full_qa_evaluations, answered_count, total_questions):
+    """Build the system prompt, user prompt and summary figures for the final report"""
+    
     answered_percent = int((answered_count / total_questions) * 100)
     
     # Handle mixed string/dict evaluations - Enhanced processing
@@ -14,8 +62,14 @@ def generate_final_feedback(full_qa_evaluations, answered_count, total_questions
     total_score = 0
     valid_scores = 0
     
+    pending_count = 0
+    
     for i, eval_item in enumerate(full_qa_evaluations):
-        if isinstance(eval_item, dict):
+        if is_pending(eval_item):
+            # Still being evaluated: no score or feedback to draw on yet
+            pending_count += 1
+            formatted_evaluations.append(f"Question {i+1} Evaluation: PENDING - not evaluated yet, do not assess this answer")
+        elif isinstance(eval_item, dict):
             # Convert dict to readable string
             eval_parts = [f"Question {i+1} Evaluation:"]
             
@@ -58,6 +112,8 @@ def generate_final_feedback(full_qa_evaluations, answered_count, total_questions
     partial_notice = ""
     if answered_count < total_questions:
         partial_notice = f" NOTE: This is a partial report based on {answered_count}/{total_questions} answered questions ({answered_percent}% completion)."
+    if pending_count:
+        partial_notice += f" NOTE: {pending_count} answer(s) are still being evaluated; base the assessment only on the evaluated answers."
     
     system_prompt = """You are an expert AI interview coach and career advisor. 
     Generate comprehensive, constructive feedback that helps candidates improve their interview skills. 
@@ -104,29 +160,29 @@ def generate_final_feedback(full_qa_evaluations, answered_count, total_questions
     Write in a professional yet encouraging tone. Be specific with recommendations and provide actionable advice.
     """
 
-    try:
-        final_report = llm_manager.generate_response(user_prompt, system_prompt)
-        print("✅ Final report generated successfully")
-        return final_report
-        
-    except Exception as e:
-        error_msg = f"Report generation failed: {str(e)}"
-        print(f"❌ {error_msg}")
-        
-        # Provide a basic fallback report
-        fallback_report = f"""
+    summary = {
+        'answered_count': answered_count,
+        'total_questions': total_questions,
+        'answered_percent': answered_percent,
+        'avg_score': avg_score,
+        'joined_evaluations': joined_evaluations
+    }
+    return system_prompt, user_prompt, summary
+
+def _fallback_report(summary, error_msg):
+    """Basic report used when the LLM call fails"""
+    return f"""
 # Interview Report
 
 ## Performance Summary
-- Questions Answered: {answered_count}/{total_questions} ({answered_percent}%)
-- Average Score: {avg_score:.1f}%
+- Questions Answered: {summary['answered_count']}/{summary['total_questions']} ({summary['answered_percent']}%)
+- Average Score: {summary['avg_score']:.1f}%
 
 ## Evaluation Details
-{joined_evaluations}
+{summary['joined_evaluations']}
 
 ## Technical Issue
 {error_msg}
 
 Please try generating the report again or contact support if the issue persists.
 """
-        return fallback_report
@@ -4,10 +4,15 @@ import os
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(PROJECT_ROOT)
 from config import Config
+from utils.async_loop import background_loop
 from utils.llm_manager import llm_manager
 
 def generate_interview_plan(resume_briefing, difficulty="medium"):
     """Generate interview plan using the configured LLM provider"""
+    return background_loop.run(agenerate_interview_plan(resume_briefing, difficulty))
+
+async def agenerate_interview_plan(resume_briefing, difficulty="medium"):
+    """Async interview plan generation using the configured LLM provider"""
     
     system_prompt = """You are an expert interview designer. Based on the resume analysis provided, 
     create a comprehensive interview plan with diverse question types that assess both technical 
@@ -61,7 +66,7 @@ def generate_interview_plan(resume_briefing, difficulty="medium"):
     """
 
     try:
-        interview_plan = llm_manager.generate_response(user_prompt, system_prompt)
+        interview_plan = await llm_manager.agenerate_response(user_prompt, system_prompt)
         print("✅ Interview plan generated successfully")
         return interview_plan
         
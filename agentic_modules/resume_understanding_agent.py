@@ -6,10 +6,15 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(PROJECT_ROOT)  
 from agentic_modules.document_loader import load_resume
 from config import Config
+from utils.async_loop import background_loop
 from utils.llm_manager import llm_manager
 
 def analyze_resume(resume_text, output_format="text"):
     """Analyze resume using the configured LLM provider"""
+    return background_loop.run(aanalyze_resume(resume_text, output_format))
+
+async def aanalyze_resume(resume_text, output_format="text"):
+    """Async resume analysis using the configured LLM provider"""
     
     system_prompt = """You are a professional technical recruiter and resume analyst. 
     Analyze the provided resume and extract key information including:
@@ -52,7 +57,7 @@ def analyze_resume(resume_text, output_format="text"):
     """
 
     try:
-        briefing = llm_manager.generate_response(user_prompt, system_prompt)
+        briefing = await llm_manager.agenerate_response(user_prompt, system_prompt)
         
         # Validate and return JSON if requested
         if output_format == "json":
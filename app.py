@@ -1,12 +1,12 @@
 # app.py 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_file, flash, get_flashed_messages
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, send_file, flash, get_flashed_messages, Response, stream_with_context
 import os
 import tempfile
 import json
 import sys
 import base64
-import pickle
 import threading
+import time
 import atexit
 import signal
 from datetime import datetime
@@ -24,9 +24,19 @@ try:
     from agentic_modules.resume_understanding_agent import analyze_resume
     from agentic_modules.interview_planner_agent import generate_interview_plan
     from agentic_modules.audio_interview_agent import extract_questions_from_plan
-    from agentic_modules.evaluation_agent import evaluate_answer_dynamically
-    from agentic_modules.feedback_agent import generate_final_feedback
-    from utils.speech_to_text_whisper import create_speech_to_text
+    from agentic_modules.evaluation_agent import evaluate_answer_dynamically, evaluate_answers_batch
+    from agentic_modules.feedback_agent import stream_final_feedback
+    from utils.speech_to_text_whisper import SpeechToTextProvider
+    from utils.stt_service import TranscriptionService, ServiceBusyError
+    from utils.stt_streaming import StreamingTranscription, streaming_available
+    from utils.llm_manager import llm_manager
+    from utils.evaluation_queue import EvaluationQueue, PENDING_EVALUATION, is_pending
+    from utils.session_store import SessionStore, create_session_backend
+    from utils.job_manager import JobManager
+    from utils.memory_probe import PeakRSSTracker
+    from utils.tts_cache import tts_cache
+    from utils.tts_pool import tts_pool
+    from utils.text_to_speech import tts_engine, audio_mime_type, split_sentences
     from config import Config
     print("✅ All AI modules loaded successfully!")
 except ImportError as e:
@@ -34,6 +44,14 @@ except ImportError as e:
     print("🔧 Make sure all your modules are in the correct directories")
     sys.exit(1)
 
+# WebSocket support is optional; without it the interview page posts whole clips
+try:
+    from flask_sock import Sock
+    FLASK_SOCK_AVAILABLE = True
+except ImportError:
+    FLASK_SOCK_AVAILABLE = False
+    print("⚠️ flask-sock not installed - streaming transcription disabled")
+
 # Flask app configuration
 app = Flask(__name__)
 app.secret_key = 'ai-interview-agent-secret-key-change-in-production'
@@ -51,16 +69,13 @@ os.makedirs(app.config['SESSION_FOLDER'], exist_ok=True)
 os.makedirs('whisper_temp', exist_ok=True)
 os.makedirs('temp_reports', exist_ok=True)
 
-# Initialize Speech-to-Text once with proper error handling
-stt_instance = None
-try:
-    from utils.speech_to_text_whisper import create_speech_to_text
-    stt_instance = create_speech_to_text(model_name=Config.WHISPER_MODEL, enhanced=True)
-    print(f"✅ In-memory Whisper model '{Config.WHISPER_MODEL}' loaded successfully!")
-except Exception as e:
-    print(f"⚠️ In-memory Whisper model loading failed: {e}")
-    print("🔧 Speech-to-text features will be disabled")
-    stt_instance = None
+# Speech-to-Text models load in the background; requests reach them through a bounded queue
+stt_provider = SpeechToTextProvider(Config.WHISPER_MODEL)
+stt_service = TranscriptionService(stt_provider)
+if Config.WHISPER_PRELOAD:
+    stt_provider.start()
+    stt_service.start()
+
 # ===== CLEANUP FUNCTIONS =====
 
 def cleanup_resources():
@@ -71,6 +86,12 @@ def cleanup_resources():
     
     print("🧹 Cleaning up resources...")
     
+    # Persist sessions still waiting for write-behind
+    try:
+        session_store.flush()
+    except Exception as e:
+        print(f"❌ Error flushing sessions: {e}")
+    
     # Clean up active threads
     for thread in active_threads:
         if thread.is_alive():
@@ -115,35 +136,38 @@ def inject_template_vars():
 
 # ===== SESSION MANAGEMENT HELPERS =====
 
+session_store = SessionStore(create_session_backend(app.config['SESSION_FOLDER']))
+session_store.start()
+
 def save_session_data(session_id, data):
-    """Save session data to file with proper error handling"""
+    """Save session data to the session store with proper error handling"""
     try:
-        session_file = os.path.join(app.config['SESSION_FOLDER'], f"{session_id}.pkl")
-        with open(session_file, 'wb') as f:
-            pickle.dump(data, f)
+        session_store.put(session_id, data)
         return True
     except Exception as e:
         print(f"❌ Error saving session data: {e}")
         return False
 
 def load_session_data(session_id):
-    """Load session data from file with proper error handling"""
+    """Load session data from the session store with proper error handling"""
     try:
-        session_file = os.path.join(app.config['SESSION_FOLDER'], f"{session_id}.pkl")
-        if os.path.exists(session_file):
-            with open(session_file, 'rb') as f:
-                return pickle.load(f)
-        return None
+        return session_store.get(session_id)
     except Exception as e:
         print(f"❌ Error loading session data: {e}")
         return None
 
+def modify_session_data(session_id, fn, create=False):
+    """Apply fn(data) as one read-modify-write cycle (retried on concurrent writes); returns fn's result"""
+    try:
+        return session_store.update(session_id, fn, create=create)
+    except Exception as e:
+        print(f"❌ Error updating session data: {e}")
+        return None
+
 def delete_session_data(session_id):
-    """Delete session data file with proper error handling"""
+    """Delete session data with proper error handling"""
     try:
-        session_file = os.path.join(app.config['SESSION_FOLDER'], f"{session_id}.pkl")
-        if os.path.exists(session_file):
-            os.remove(session_file)
+        session_store.delete(session_id)
         return True
     except Exception as e:
         print(f"❌ Error deleting session data: {e}")
@@ -162,9 +186,153 @@ def update_session_data(updates):
     if not interview_id:
         return False
     
-    data = load_session_data(interview_id) or {}
-    data.update(updates)
-    return save_session_data(interview_id, data)
+    def apply(data):
+        data.update(updates)
+        return True
+    
+    return modify_session_data(interview_id, apply, create=True) or False
+
+# ===== BACKGROUND EVALUATION =====
+
+def store_evaluation_result(interview_id, question_index, evaluation):
+    """Write a finished background evaluation back into the session record"""
+    def apply(data):
+        evaluations = data.get('evaluations', [])
+        if question_index < len(evaluations):
+            evaluations[question_index] = evaluation
+            data['evaluations'] = evaluations
+    
+    # Missing sessions (reset while the answer was being evaluated) are skipped
+    modify_session_data(interview_id, apply)
+
+evaluation_queue = EvaluationQueue(evaluate_answer_dynamically, evaluate_answers_batch)
+evaluation_queue.set_result_handler(store_evaluation_result)
+
+# ===== RESUME ANALYSIS JOBS =====
+
+ANALYSIS_STAGES = ('loading', 'analyzing', 'planning', 'extracting')
+
+def run_analysis_pipeline(job, interview_id, candidate_name, file_path):
+    """Load the resume, analyze it, plan the interview and extract questions"""
+    try:
+        # Step 1: Load resume using  existing module
+        job.stage('loading')
+        resume_text = load_resume(file_path)
+        
+        # Step 2: Analyze resume using  existing module
+        job.stage('analyzing')
+        resume_analysis = analyze_resume(resume_text)
+        
+        # Step 3: Generate interview plan using  existing module
+        job.stage('planning')
+        interview_plan = generate_interview_plan(resume_analysis)
+        
+        # Step 4: Extract questions using  existing module
+        job.stage('extracting')
+        questions = extract_questions_from_plan(interview_plan)
+        
+        # Update session data
+        session_data = {
+            'resume_text': resume_text,
+            'resume_analysis': resume_analysis,
+            'interview_plan': interview_plan,
+            'questions': questions,
+            'answers': [],
+            'evaluations': [],
+            'current_question': 0,
+            'stage': 'interview',
+            'candidate_name': candidate_name,
+            'created_at': datetime.now().isoformat(),
+            'final_report': ''
+        }
+        if not save_session_data(interview_id, session_data):
+            raise RuntimeError("could not save interview session")
+        
+        print(f"✅ Resume processed successfully! Generated {len(questions)} questions.")
+        
+        # Render every question's audio in the background so "Listen" is a cache hit
+        if Config.TTS_PRESYNTHESIZE and questions:
+            if presynthesis_jobs.submit(presynthesize_questions, args=(questions,),
+                                        stages=('synthesizing',), owner=interview_id) is None:
+                print("⚠️ Pre-synthesis queue full, questions will be synthesized on demand")
+        return {'question_count': len(questions)}
+    finally:
+        # Clean up uploaded file
+        safe_file_cleanup(file_path)
+
+def mirror_job_progress(job):
+    """Copy job progress into the session so any worker process can answer a poll"""
+    snapshot = job.to_dict()
+    modify_session_data(job.owner, lambda data: data.update({'analysis_job': snapshot}))
+
+analysis_jobs = JobManager()
+analysis_jobs.set_progress_handler(mirror_job_progress)
+
+def presynthesize_questions(job, questions):
+    """Synthesize question audio into the TTS cache"""
+    job.stage('synthesizing')
+    synthesized = tts_engine.presynthesize(questions, Config.TTS_VOICE)
+    print(f"🔊 Pre-synthesized {synthesized} of {len(questions)} questions")
+    return {'synthesized': synthesized}
+
+presynthesis_jobs = JobManager(num_workers=1)
+
+def pending_evaluation_indexes(data):
+    """Question indexes whose evaluation placeholder is still in the session"""
+    return [index for index, evaluation in enumerate(data.get('evaluations', [])) if is_pending(evaluation)]
+
+def requeue_lost_evaluations(interview_id, data):
+    """Queue again placeholders nobody is evaluating (e.g. left behind by a restart)
+
+    With a shared session backend another worker may own a placeholder, so it only counts
+    as lost once it is older than EVALUATION_TIMEOUT.
+    """
+    queued = evaluation_queue.pending_indexes(interview_id)
+    questions = data.get('questions', [])
+    answers = data.get('answers', [])
+    evaluations = data.get('evaluations', [])
+    for index in pending_evaluation_indexes(data):
+        if index in queued or index >= len(questions) or index >= len(answers):
+            continue
+        queued_at = evaluations[index].get('queued_at')
+        if session_store.shared and queued_at and time.time() - queued_at < Config.EVALUATION_TIMEOUT:
+            continue
+        if evaluation_queue.submit(interview_id, index, questions[index], answers[index]):
+            print(f"🔁 Re-queued lost evaluation for Q{index + 1}")
+        else:
+            print(f"⚠️ Evaluation queue full, Q{index + 1} stays pending")
+
+def wait_for_evaluations(interview_id, data):
+    """Wait up to EVALUATION_TIMEOUT for the session's pending evaluations; returns the latest data
+
+    Another worker process may be evaluating some of the answers, so the session itself is
+    re-read every EVALUATION_POLL_INTERVAL instead of relying on this process's queue alone.
+    """
+    pending = pending_evaluation_indexes(data)
+    if not pending:
+        return data
+    
+    requeue_lost_evaluations(interview_id, data)
+    print(f"⏳ Waiting for {len(pending)} pending evaluations...")
+    deadline = time.time() + Config.EVALUATION_TIMEOUT
+    while pending:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            print(f"⚠️ {len(pending)} evaluations are still pending")
+            break
+        interval = min(remaining, Config.EVALUATION_POLL_INTERVAL)
+        if evaluation_queue.pending_count(interview_id):
+            evaluation_queue.wait_for(interview_id, timeout=interval)
+        else:
+            time.sleep(interval)
+        data = load_session_data(interview_id) or data
+        pending = pending_evaluation_indexes(data)
+    return data
+
+def evaluation_counts(evaluations):
+    """Return (pending, completed) evaluation counts"""
+    pending = len([e for e in evaluations if is_pending(e)])
+    return pending, len(evaluations) - pending
 
 # ===== UTILITY FUNCTIONS =====
 
@@ -233,87 +401,83 @@ def upload_resume():
         flash('Please start a new interview session', 'error')
         return redirect(url_for('index'))
     return render_template('upload.html', 
-                         candidate_name=session['candidate_name'])
+                         candidate_name=session['candidate_name'],
+                         job_id=request.args.get('job', ''))
 
 @app.route('/analyze', methods=['POST'])
 def analyze_resume_route():
-    """Process uploaded resume and generate questions"""
+    """Accept an uploaded resume and start the analysis pipeline in the background"""
+    wants_json = request.accept_mimetypes.best == 'application/json'
+    
+    def reject(message, status=400):
+        if wants_json:
+            return jsonify({'error': message}), status
+        flash(message, 'error')
+        return redirect(url_for('upload_resume'))
+    
     if 'candidate_name' not in session:
+        if wants_json:
+            return jsonify({'error': 'Please start a new interview session', 'redirect_url': url_for('index')}), 400
         flash('Please start a new interview session', 'error')
         return redirect(url_for('index'))
     
     if 'resume_file' not in request.files:
-        flash('No file uploaded', 'error')
-        return redirect(url_for('upload_resume'))
+        return reject('No file uploaded')
     
     file = request.files['resume_file']
     if file.filename == '':
-        flash('No file selected', 'error')
-        return redirect(url_for('upload_resume'))
+        return reject('No file selected')
     
     if not allowed_file(file.filename):
-        flash('Invalid file type. Please upload PDF, DOC, or DOCX files only.', 'error')
-        return redirect(url_for('upload_resume'))
+        return reject('Invalid file type. Please upload PDF, DOC, or DOCX files only.')
     
+    interview_id = session['interview_id']
     filename = secure_filename(file.filename)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session['interview_id']}_{filename}")
+    file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{interview_id}_{filename}")
     
     try:
         # Save uploaded file
         file.save(file_path)
         print(f"📄 Resume uploaded: {filename}")
-        
-        # Step 1: Load resume using  existing module
-        print("📖 Loading resume content...")
-        resume_text = load_resume(file_path)
-        
-        # Step 2: Analyze resume using  existing module
-        print("🧠 Analyzing resume...")
-        resume_analysis = analyze_resume(resume_text)
-        
-        # Step 3: Generate interview plan using  existing module
-        print("📝 Generating interview plan...")
-        interview_plan = generate_interview_plan(resume_analysis)
-        
-        # Step 4: Extract questions using  existing module
-        print("❓ Extracting questions...")
-        questions = extract_questions_from_plan(interview_plan)
-        
-        # Update session data in file
-        session_data = {
-            'resume_text': resume_text,
-            'resume_analysis': resume_analysis,
-            'interview_plan': interview_plan,
-            'questions': questions,
-            'answers': [],
-            'evaluations': [],
-            'current_question': 0,
-            'stage': 'interview',
-            'candidate_name': session['candidate_name'],
-            'created_at': datetime.now().isoformat(),
-            'final_report': ''
-        }
-        
-        save_session_data(session['interview_id'], session_data)
-        
-        # Update Flask session stage
-        session['stage'] = 'interview'
-        
-        # Clean up uploaded file
-        safe_file_cleanup(file_path)
-        
-        print(f"✅ Resume processed successfully! Generated {len(questions)} questions.")
-        flash(f'Resume analyzed successfully! Generated {len(questions)} personalized questions.', 'success')
-        return redirect(url_for('interview'))
-        
     except Exception as e:
-        # Clean up on error
         safe_file_cleanup(file_path)
-        
         error_msg = f"Error processing resume: {str(e)}"
         print(f"❌ {error_msg}")
-        flash(error_msg, 'error')
-        return redirect(url_for('upload_resume'))
+        return reject(error_msg, 500)
+    
+    job = analysis_jobs.submit(run_analysis_pipeline,
+                               args=(interview_id, session['candidate_name'], file_path),
+                               stages=ANALYSIS_STAGES,
+                               owner=interview_id)
+    if job is None:
+        safe_file_cleanup(file_path)
+        return reject('The server is busy analyzing other resumes. Please try again in a minute.', 503)
+    
+    print(f"🧾 Resume analysis queued as job {job.id[:8]}")
+    if wants_json:
+        return jsonify({'job_id': job.id, 'status_url': url_for('job_status', job_id=job.id)}), 202
+    return redirect(url_for('upload_resume', job=job.id))
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Poll a resume analysis job"""
+    interview_id = session.get('interview_id')
+    job = analysis_jobs.get(job_id)
+    if job is not None:
+        if job.owner != interview_id:
+            return jsonify({'error': 'Job not found'}), 404
+        status = job.to_dict()
+    else:
+        # The job may be running in another worker process; it mirrors progress into the session
+        data = load_session_data(interview_id) if interview_id else None
+        status = (data or {}).get('analysis_job')
+        if not status or status.get('job_id') != job_id:
+            return jsonify({'error': 'Job not found'}), 404
+    
+    if status['status'] == 'completed':
+        session['stage'] = 'interview'
+        status['redirect_url'] = url_for('interview')
+    return jsonify(status)
 
 @app.route('/interview')
 def interview():
@@ -343,17 +507,21 @@ def interview():
             scores.append(eval_data['score'])
     avg_score = sum(scores) / len(scores) if scores else 0
     
+    current_question_text = questions[current_question] if current_question < len(questions) else ""
+    
     return render_template('interview.html',
                          candidate_name=session['candidate_name'],
                          questions=questions,
                          answers=answers,
                          evaluations=evaluations,
                          current_question=current_question,
-                         current_question_text=questions[current_question] if current_question < len(questions) else "",
+                         current_question_text=current_question_text,
+                         question_sentences=len(split_sentences(current_question_text)) if current_question_text else 0,
                          progress=progress,
                          answered_count=answered_count,
                          avg_score=avg_score,
-                         total_questions=len(questions))
+                         total_questions=len(questions),
+                         streaming_transcription=FLASK_SOCK_AVAILABLE and Config.STT_STREAMING)
 
 @app.route('/submit_answer', methods=['POST'])
 def submit_answer():
@@ -366,11 +534,6 @@ def submit_answer():
     answer = request.form.get('answer', '').strip()
     action = request.form.get('action', 'submit')
     
-    questions = data['questions']
-    answers = data.get('answers', [])
-    evaluations = data.get('evaluations', [])
-    current_question = data.get('current_question', 0)
-    
     # Handle skip action
     if action == 'skip':
         answer = "[Skipped]"
@@ -380,44 +543,65 @@ def submit_answer():
         flash('Please provide an answer or skip the question', 'error')
         return redirect(url_for('interview'))
     
-    print(f"📝 Processing answer for question {current_question + 1}: {answer[:50]}{'...' if len(answer) > 50 else ''}")
-    
-    # Store answer
-    answers.append(answer)
+    interview_id = session['interview_id']
     
-    # Evaluate answer using existing module
-    if answer != "[Skipped]":
-        try:
-            question = questions[current_question]
-            print(f"🤖 Evaluating answer...")
-            evaluation = evaluate_answer_dynamically(question, answer)
-            evaluations.append(evaluation)
-            print(f"✅ Answer evaluated. Score: {evaluation.get('score', 'N/A')}%")
-        except Exception as e:
-            error_msg = f"Evaluation failed: {str(e)}"
-            print(f"❌ {error_msg}")
+    def record_answer(data):
+        questions = data['questions']
+        answers = data.get('answers', [])
+        evaluations = data.get('evaluations', [])
+        current_question = data.get('current_question', 0)
+        
+        if current_question >= len(questions):
+            return None
+        
+        print(f"📝 Processing answer for question {current_question + 1}: {answer[:50]}{'...' if len(answer) > 50 else ''}")
+        
+        # Store answer
+        answers.append(answer)
+        
+        if answer != "[Skipped]":
+            # Evaluate in the background; the placeholder is replaced when the result arrives
+            evaluations.append(dict(PENDING_EVALUATION, queued_at=time.time()))
+        else:
             evaluations.append({
                 'score': 0, 
-                'feedback': error_msg,
-                'suggestions': ['Technical issue occurred during evaluation'],
-                'confidence': 'Low'
+                'feedback': 'Question skipped by candidate',
+                'suggestions': ['Try to answer all questions for better assessment'],
+                'confidence': 'High'
             })
-    else:
-        evaluations.append({
-            'score': 0, 
-            'feedback': 'Question skipped by candidate',
-            'suggestions': ['Try to answer all questions for better assessment'],
-            'confidence': 'High'
+        
+        # Update session data
+        data.update({
+            'answers': answers,
+            'evaluations': evaluations,
+            'current_question': current_question + 1
         })
+        return questions, current_question
     
-    # Update session data
-    data.update({
-        'answers': answers,
-        'evaluations': evaluations,
-        'current_question': current_question + 1
-    })
+    recorded = modify_session_data(interview_id, record_answer)
+    if recorded is None:
+        return redirect(url_for('generate_results'))
+    questions, current_question = recorded
     
-    save_session_data(session['interview_id'], data)
+    if answer != "[Skipped]":
+        question = questions[current_question]
+        if evaluation_queue.submit(interview_id, current_question, question, answer):
+            print(f"🤖 Answer queued for evaluation")
+        else:
+            # Queue is saturated - evaluate inline rather than drop the answer
+            print(f"⚠️ Evaluation queue full, evaluating inline...")
+            try:
+                evaluation = evaluate_answer_dynamically(question, answer)
+            except Exception as e:
+                error_msg = f"Evaluation failed: {str(e)}"
+                print(f"❌ {error_msg}")
+                evaluation = {
+                    'score': 0, 
+                    'feedback': error_msg,
+                    'suggestions': ['Technical issue occurred during evaluation'],
+                    'confidence': 'Low'
+                }
+            store_evaluation_result(interview_id, current_question, evaluation)
     
     return redirect(url_for('interview'))
 
@@ -429,21 +613,17 @@ def generate_results():
         flash('No interview data found', 'error')
         return redirect(url_for('index'))
     
+    # Only wait for answers that are still being evaluated in the background
+    interview_id = session['interview_id']
+    data = wait_for_evaluations(interview_id, data)
+    
     questions = data.get('questions', [])
     answers = data.get('answers', [])
     evaluations = data.get('evaluations', [])
     
-    print("📊 Generating final report...")
-    
-    # Generate final feedback using existing module
+    # The report itself is streamed to the page from /results/stream
     answered_count = len([a for a in answers if a != "[Skipped]"])
-    try:
-        final_report = generate_final_feedback(evaluations, answered_count, len(questions))
-        print("✅ Final report generated successfully!")
-    except Exception as e:
-        error_msg = f"Report generation failed: {str(e)}"
-        print(f"❌ {error_msg}")
-        final_report = error_msg
+    final_report = data.get('final_report', '')
     
     # Calculate comprehensive metrics
     scores = []
@@ -455,15 +635,12 @@ def generate_results():
     completion_rate = (answered_count / len(questions)) * 100 if questions else 0
     
     # Update session data with results
-    data.update({
-        'final_report': final_report,
+    update_session_data({
         'avg_score': avg_score,
         'completion_rate': completion_rate,
         'scores': scores,
         'stage': 'results'
     })
-    
-    save_session_data(session['interview_id'], data)
     session['stage'] = 'results'
     
     return render_template('results.html',
@@ -479,35 +656,175 @@ def generate_results():
                          scores=scores,
                          interview_id=session.get('interview_id'))
 
+def sse(payload, event=None):
+    """Format one Server-Sent Events message (JSON payload, optional event name)"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+@app.route('/results/stream')
+def stream_results():
+    """Stream the final report to the browser as Server-Sent Events"""
+    data = get_current_session_data()
+    if not data or 'questions' not in data:
+        return jsonify({'error': 'No interview data found'}), 404
+    
+    interview_id = session['interview_id']
+    questions = data.get('questions', [])
+    answers = data.get('answers', [])
+    evaluations = data.get('evaluations', [])
+    answered_count = len([a for a in answers if a != "[Skipped]"])
+    existing_report = data.get('final_report', '')
+    # A report written around unfinished evaluations is shown but not kept as final
+    provisional = bool(pending_evaluation_indexes(data))
+    
+    def generate():
+        if existing_report:
+            yield sse({'chunk': existing_report})
+            yield sse({'length': len(existing_report)}, event='done')
+            return
+        
+        print("📊 Streaming final report...")
+        parts = []
+        try:
+            for chunk in stream_final_feedback(evaluations, answered_count, len(questions)):
+                parts.append(chunk)
+                yield sse({'chunk': chunk})
+        except Exception as e:
+            # Partial output is not saved: the next visit generates the report again
+            error_msg = f"Report generation failed: {str(e)}"
+            print(f"❌ {error_msg}")
+            yield sse({'error': error_msg}, event='error')
+            return
+        
+        final_report = "".join(parts)
+        if provisional:
+            print("⚠️ Final report streamed with evaluations still pending, not saved")
+            yield sse({'length': len(final_report), 'provisional': True}, event='done')
+            return
+        modify_session_data(interview_id, lambda latest: latest.update({'final_report': final_report}))
+        print("✅ Final report streamed and saved!")
+        yield sse({'length': len(final_report)}, event='done')
+    
+    return Response(stream_with_context(generate()),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def pin_language(interview_id, data, result):
+    """Remember the first confidently detected language for the rest of the interview"""
+    probability = result.get('language_probability')
+    if data.get('language') or probability is None or probability < Config.WHISPER_LANGUAGE_PIN_CONFIDENCE:
+        return
+    
+    def apply(latest):
+        if not latest.get('language'):
+            latest['language'] = result['language']
+            latest['language_probability'] = round(probability, 3)
+    
+    modify_session_data(interview_id, apply)
+    print(f"📌 Interview language pinned to '{result['language']}' ({probability:.2f})")
+
+# Common Whisper output for silence, breathing and background noise
+NOISE_PATTERNS = [
+    'you', 'uh', 'um', 'ah', 'er', 'hmm', 'mm',
+    'thank you.', 'thanks.', 'bye.', 'hello.', 'hi.',
+    'okay.', 'ok.', '...', '. .', ', ,', '? ?'
+]
+
+def is_noise_only(transcription):
+    """True when a transcription contains nothing but filler/noise artifacts"""
+    clean_words = [w.strip('.,!?') for w in transcription.lower().split()]
+    return (len(transcription) < 5 or
+            transcription.lower().strip('.,!? ') in NOISE_PATTERNS or
+            all(word in NOISE_PATTERNS for word in clean_words))
+
+def audio_upload_format():
+    """How the client sent its clip: 'binary' body, 'multipart' form or legacy 'base64' JSON"""
+    if request.is_json:
+        return 'base64'
+    if request.mimetype == 'multipart/form-data':
+        return 'multipart'
+    return 'binary'
+
+def read_audio_upload(upload_format):
+    """Return (audio bytes, language hint) from the request body
+
+    Binary bodies are read straight into one buffer sized from Content-Length, which
+    the decoder consumes as is. Raises ValueError on malformed base64.
+    """
+    if upload_format == 'base64':
+        request_data = request.get_json() or {}
+        audio_data = request_data.get('audio_data')
+        if not audio_data:
+            return None, None
+        return base64.b64decode(audio_data), request_data.get('language')
+    
+    if upload_format == 'multipart':
+        upload = request.files.get('audio')
+        if upload is None:
+            return None, None
+        return upload.read(), request.form.get('language')
+    
+    length = request.content_length
+    readinto = getattr(request.stream, 'readinto', None)
+    if not length or readinto is None:
+        return request.get_data(cache=False), request.args.get('language')
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    received = 0
+    while received < length:
+        count = readinto(view[received:])
+        if not count:
+            break
+        received += count
+    view.release()
+    if received < length:
+        del buffer[received:]
+    return buffer, request.args.get('language')
+
+upload_rss = PeakRSSTracker()
+
 @app.route('/transcribe_audio', methods=['POST'])
 def transcribe_audio():
-    """Handle audio transcription using in-memory processing (Windows compatible)"""
+    """Handle audio transcription using in-memory processing (Windows compatible)
+
+    Accepts the clip as a raw body (application/octet-stream or the recording's own
+    audio/* type), as multipart form field 'audio', or base64 in JSON {'audio_data'}.
+    """
+    upload_format = audio_upload_format()
+    baseline = upload_rss.start() if Config.MEASURE_REQUEST_RSS else None
+    response = transcribe_uploaded_audio(upload_format)
+    growth = upload_rss.finish(upload_format, baseline)
+    if growth is not None:
+        print(f"📈 Peak RSS +{growth / 1024:.1f}MB for {upload_format} upload")
+    return response
+
+def transcribe_uploaded_audio(upload_format):
+    """Transcribe the request's clip; returns the /transcribe_audio response"""
     data = get_current_session_data()
     if not data:
         return jsonify({'error': 'No active interview session'})
     
-    if not stt_instance:
+    if not stt_provider.get(timeout=Config.WHISPER_LOAD_WAIT):
+        if stt_provider.status()['state'] in ('idle', 'loading'):
+            response = jsonify({'error': 'Speech recognition is still loading, please try again shortly',
+                                'status': 'loading'})
+            response.headers['Retry-After'] = str(Config.WHISPER_RETRY_AFTER)
+            return response, 503
         return jsonify({'error': 'Speech recognition not available'})
     
     try:
         # Get audio data from request
-        request_data = request.get_json()
-        audio_data = request_data.get('audio_data')
-        
-        if not audio_data:
-            return jsonify({'error': 'No audio data provided'})
-        
-        print("🎤 Processing audio for transcription...")
-        
-        # Decode base64 audio
         try:
-            import base64
-            audio_bytes = base64.b64decode(audio_data)
-            print(f"📦 Decoded audio: {len(audio_bytes)} bytes")
-        except Exception as e:
+            audio_bytes, requested_language = read_audio_upload(upload_format)
+        except ValueError as e:
             print(f"❌ Base64 decode error: {e}")
             return jsonify({'error': f'Invalid audio data format: {str(e)}'})
         
+        if not audio_bytes:
+            return jsonify({'error': 'No audio data provided'})
+        
+        print(f"🎤 Processing audio for transcription ({upload_format} upload, {len(audio_bytes)} bytes)...")
+        
         # Validate audio size
         if len(audio_bytes) < 1000:  # Less than 1KB
             print("⚠️ Audio file too small")
@@ -521,8 +838,18 @@ def transcribe_audio():
         try:
             print(f"🎯 Starting in-memory transcription...")
             
-            # Use the new in-memory transcription method
-            transcription = stt_instance.transcribe_audio_data(audio_bytes)
+            # Once the interview's language is known, skip language detection
+            language = requested_language or data.get('language')
+            try:
+                result = stt_service.transcribe(audio_bytes, language=language)
+            except ServiceBusyError:
+                print("⚠️ Transcription queue full, asking client to retry")
+                response = jsonify({'error': 'Speech recognition is busy, please try again shortly',
+                                    'status': 'busy'})
+                response.headers['Retry-After'] = str(Config.WHISPER_RETRY_AFTER)
+                return response, 503
+            transcription = result['text']
+            pin_language(session['interview_id'], data, result)
             
             print(f"📝 Raw transcription: '{transcription}'")
             
@@ -530,20 +857,8 @@ def transcribe_audio():
                 # Additional cleaning for better results
                 transcription = transcription.strip()
                 
-                # Filter out common noise patterns
-                noise_patterns = [
-                    'you', 'uh', 'um', 'ah', 'er', 'hmm', 'mm',
-                    'thank you.', 'thanks.', 'bye.', 'hello.', 'hi.',
-                    'okay.', 'ok.', '...', '. .', ', ,', '? ?'
-                ]
-                
                 # Check if transcription is just noise
-                words = transcription.lower().split()
-                clean_words = [w.strip('.,!?') for w in words]
-                
-                if (len(transcription) < 5 or 
-                    transcription.lower().strip('.,!? ') in noise_patterns or
-                    all(word in noise_patterns for word in clean_words)):
+                if is_noise_only(transcription):
                     
                     print("🔇 Detected only noise/artifacts")
                     return jsonify({
@@ -559,6 +874,7 @@ def transcribe_audio():
                     'message': 'Audio transcribed successfully',
                     'length': len(transcription),
                     'word_count': len(transcription.split()),
+                    'language': result['language'],
                     'method': 'in_memory'  # Indicates we used in-memory processing
                 })
             else:
@@ -599,14 +915,87 @@ def transcribe_audio():
         error_msg = f"Request processing failed: {str(e)}"
         print(f"❌ {error_msg}")
         return jsonify({'error': error_msg})
-    
+
+if FLASK_SOCK_AVAILABLE:
+    sock = Sock(app)
+
+    @sock.route('/ws/transcribe')
+    def transcribe_stream(ws):
+        """Transcribe an answer while it is recorded
+
+        The client sends MediaRecorder chunks as binary messages and {"type": "stop"} when
+        recording ends. The server answers with {"type": "partial", "text"} updates and one
+        {"type": "final", ...} message shaped like the /transcribe_audio response, or
+        {"type": "error"} after which the client falls back to posting the whole clip.
+        """
+        data = get_current_session_data()
+        if not data:
+            ws.send(json.dumps({'type': 'error', 'error': 'No active interview session'}))
+            return
+        if not Config.STT_STREAMING or not streaming_available() or not stt_provider.is_ready():
+            ws.send(json.dumps({'type': 'error', 'error': 'Streaming transcription not available'}))
+            return
+        
+        interview_id = session['interview_id']
+        stream = StreamingTranscription(stt_service, language=data.get('language'))
+        try:
+            stream.start()
+            ws.send(json.dumps({'type': 'ready'}))
+            while True:
+                message = ws.receive(timeout=0.25)
+                if isinstance(message, (bytes, bytearray)):
+                    stream.feed(message)
+                elif message:
+                    if json.loads(message).get('type') == 'stop':
+                        break
+                
+                partial = stream.poll()
+                if partial:
+                    ws.send(json.dumps({'type': 'partial', 'text': partial}))
+            
+            result = stream.finish()
+            pin_language(interview_id, data, result)
+            transcription = (result['text'] or '').strip()
+            if transcription and not is_noise_only(transcription):
+                print(f"✅ Streamed audio transcribed successfully: {transcription}")
+                ws.send(json.dumps({
+                    'type': 'final',
+                    'transcription': transcription,
+                    'status': 'success',
+                    'message': 'Audio transcribed successfully',
+                    'length': len(transcription),
+                    'word_count': len(transcription.split()),
+                    'language': result['language'],
+                    'seconds': result['seconds'],
+                    'method': 'streaming'
+                }))
+            else:
+                ws.send(json.dumps({
+                    'type': 'final',
+                    'transcription': '',
+                    'status': 'no_speech',
+                    'message': 'No speech detected in audio - please try speaking louder and clearer'
+                }))
+        except ServiceBusyError:
+            print("⚠️ Transcription queue full during streaming")
+            ws.send(json.dumps({'type': 'error', 'status': 'busy',
+                                'error': 'Speech recognition is busy, please try again shortly'}))
+        except Exception as e:
+            print(f"❌ Streaming transcription failed: {e}")
+            try:
+                ws.send(json.dumps({'type': 'error', 'error': f'Transcription failed: {str(e)}'}))
+            except Exception:
+                pass
+        finally:
+            stream.close()
+
 @app.route('/speak_text', methods=['POST'])
 def speak_text_route():
     """Generate speech audio for AI questions and feedback"""
     try:
         request_data = request.get_json()
         text = request_data.get('text', '').strip()
-        voice = request_data.get('voice', 'en-US-JennyNeural')
+        voice = request_data.get('voice') or Config.TTS_VOICE
         
         if not text:
             return jsonify({'error': 'No text provided'}), 400
@@ -616,21 +1005,20 @@ def speak_text_route():
         
         print(f"🔊 Generating speech for: {text[:50]}...")
         
-        # Import TTS engine
-        from utils.text_to_speech import tts_engine
-        
-        # Generate speech
-        audio_data = tts_engine.generate_speech(text, voice)
+        # Generate speech (pre-synthesized questions come straight from the cache)
+        audio_data, engine, cached = tts_engine.generate_speech_info(text, voice)
         
         if not audio_data:
             return jsonify({'error': 'No audio generated'}), 500
         
         # Convert to base64 for transmission
-        import base64
         audio_base64 = base64.b64encode(audio_data).decode()
         
         return jsonify({
             'audio_data': audio_base64,
+            'mime_type': audio_mime_type(audio_data),
+            'engine': engine,
+            'cached': cached,
             'status': 'success',
             'message': 'Speech generated successfully',
             'text_length': len(text)
@@ -641,6 +1029,60 @@ def speak_text_route():
         print(f"❌ {error_msg}")
         return jsonify({'error': error_msg}), 500
 
+@app.route('/speak_text/stream')
+def speak_text_stream():
+    """Stream speech audio as it is synthesized so playback starts on the first chunk"""
+    text = request.args.get('text', '').strip()
+    voice = request.args.get('voice') or Config.TTS_VOICE
+    
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    if len(text) > 1000:  # Limit text length
+        return jsonify({'error': 'Text too long (max 1000 characters)'}), 400
+    
+    try:
+        mime_type, chunks = tts_engine.stream_speech(text, voice)
+    except Exception as e:
+        error_msg = f"TTS failed: {str(e)}"
+        print(f"❌ {error_msg}")
+        return jsonify({'error': error_msg}), 500
+    
+    return Response(stream_with_context(chunks), mimetype=mime_type,
+                     headers={'Cache-Control': 'no-cache'})
+
+@app.route('/speak_text/sentences')
+def speak_text_sentences():
+    """Stream speech one sentence at a time (SSE) while later sentences synthesize in parallel"""
+    text = request.args.get('text', '').strip()
+    voice = request.args.get('voice') or Config.TTS_VOICE
+    
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    if len(text) > 1000:  # Limit text length
+        return jsonify({'error': 'Text too long (max 1000 characters)'}), 400
+    
+    def generate():
+        try:
+            count = 0
+            for segment in tts_engine.stream_sentences(text, voice):
+                count = segment['count']
+                audio_data = segment.pop('audio', None)
+                if audio_data:
+                    segment['audio_data'] = base64.b64encode(audio_data).decode()
+                    segment['mime_type'] = audio_mime_type(audio_data)
+                yield sse(segment)
+            yield sse({'count': count}, event='done')
+        except Exception as e:
+            error_msg = f"TTS failed: {str(e)}"
+            print(f"❌ {error_msg}")
+            yield sse({'error': error_msg}, event='error')
+    
+    return Response(stream_with_context(generate()),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/download_report')
 def download_report():
     """Download comprehensive interview report"""
@@ -760,9 +1202,11 @@ def get_progress():
     progress = ((current_question + 1) / len(questions)) * 100 if questions else 0
     answered_count = len([a for a in answers if a != "[Skipped]"])
     
-    # Calculate average score
-    scores = [eval_data.get('score', 0) for eval_data in evaluations if isinstance(eval_data, dict)]
+    # Calculate average score over finished evaluations
+    scores = [eval_data.get('score', 0) for eval_data in evaluations
+              if isinstance(eval_data, dict) and not is_pending(eval_data)]
     avg_score = sum(scores) / len(scores) if scores else 0
+    pending_count, completed_count = evaluation_counts(evaluations)
     
     return jsonify({
         'progress': progress,
@@ -770,7 +1214,9 @@ def get_progress():
         'total_questions': len(questions),
         'answered_count': answered_count,
         'avg_score': avg_score,
-        'completion_rate': (answered_count / len(questions)) * 100 if questions else 0
+        'completion_rate': (answered_count / len(questions)) * 100 if questions else 0,
+        'pending_evaluations': pending_count,
+        'completed_evaluations': completed_count
     })
 
 @app.route('/api/health')
@@ -786,9 +1232,21 @@ def health_check():
             'max_questions': getattr(Config, 'MAX_QUESTIONS', 10)
         },
         'modules_loaded': {
-            'speech_to_text': stt_instance is not None,
+            'speech_to_text': stt_provider.is_ready(),
+            'streaming_transcription': FLASK_SOCK_AVAILABLE and Config.STT_STREAMING and streaming_available(),
             'ai_modules': True
-        }
+        },
+        'speech_to_text': stt_provider.status(),
+        'transcription_service': stt_service.get_stats(),
+        'llm': llm_manager.get_stats(),
+        'evaluation_queue': evaluation_queue.get_stats(),
+        'sessions': session_store.get_stats(),
+        'jobs': analysis_jobs.get_stats(),
+        'upload_peak_rss': upload_rss.get_stats(),
+        'tts_cache': tts_cache.get_stats(),
+        'tts_offline_pool': tts_pool.get_stats(),
+        'tts_engines': tts_engine.scheduler.get_stats(),
+        'tts_presynthesis': presynthesis_jobs.get_stats()
     })
 
 # ===== ERROR HANDLERS =====
@@ -19,6 +19,24 @@ class Config:
     OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "phi3:mini")
     OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     
+    # HTTP connection pool settings (shared keep-alive session for HTTP-based providers)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))  # connections per host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5.0"))  # seconds
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "120.0"))  # seconds
+    HTTP_KEEP_ALIVE = os.getenv("HTTP_KEEP_ALIVE", "true").lower() == "true"
+    
+    # LLM concurrency limits (in-flight generations on the shared async loop)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "256"))  # all providers
+    GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "64"))
+    OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "64"))
+    OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4"))
+    
+    # LLM response cache
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))  # in-memory LRU size
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))  # seconds, 0 = never expire
+    LLM_CACHE_DB_PATH = os.getenv("LLM_CACHE_DB_PATH", "")  # SQLite file for the disk tier, empty = memory only
+    
     # Google Gemini Settings
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "your-gemini-api-key-here")
     GEMINI_MODEL = "gemini-1.5-flash"  # or "gemini-1.5-pro" for better quality
@@ -33,12 +51,60 @@ class Config:
     
     # Whisper settings
     WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+    STT_BACKEND = os.getenv("STT_BACKEND", "whisper").lower()  # whisper, whisper-int8 or faster-whisper
+    FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")  # CTranslate2 weight type
+    WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "true").lower() == "true"  # load in background at boot
+    WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "true").lower() == "true"  # warmup decode after loading
+    WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").strip().lower()  # e.g. "en"; empty = detect per interview
+    WHISPER_LANGUAGE_PIN_CONFIDENCE = float(os.getenv("WHISPER_LANGUAGE_PIN_CONFIDENCE", "0.8"))  # pin once this sure
+    WHISPER_REPLICAS = int(os.getenv("WHISPER_REPLICAS", "1"))  # model copies serving requests in parallel
+    WHISPER_THREADS_PER_REPLICA = int(os.getenv("WHISPER_THREADS_PER_REPLICA", "0"))  # 0 = cores / replicas
+    WHISPER_QUEUE_SIZE = int(os.getenv("WHISPER_QUEUE_SIZE", "16"))  # queued clips before answering 503
+    WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))  # clips decoded together, 1 = no batching
+    WHISPER_BATCH_WINDOW_MS = int(os.getenv("WHISPER_BATCH_WINDOW_MS", "30"))  # wait to fill a batch
+    WHISPER_REQUEST_TIMEOUT = float(os.getenv("WHISPER_REQUEST_TIMEOUT", "120"))  # seconds a request waits
+    WHISPER_RETRY_AFTER = int(os.getenv("WHISPER_RETRY_AFTER", "5"))  # Retry-After seconds on 503
+    WHISPER_LOAD_WAIT = float(os.getenv("WHISPER_LOAD_WAIT", "0"))  # seconds a request waits for a loading model
+    MEASURE_REQUEST_RSS = os.getenv("MEASURE_REQUEST_RSS", "false").lower() == "true"  # peak RSS per upload (Linux)
+    STT_STREAMING = os.getenv("STT_STREAMING", "true").lower() == "true"  # WebSocket partial transcripts
+    STT_STREAM_PARTIAL_SECONDS = float(os.getenv("STT_STREAM_PARTIAL_SECONDS", "2.0"))  # new audio per partial
+    STT_STREAM_COMMIT_SECONDS = float(os.getenv("STT_STREAM_COMMIT_SECONDS", "20.0"))  # finalize audio this old
     
     # TTS settings
     TTS_VOICE = os.getenv("TTS_VOICE", "en-US-JennyNeural")
+    TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", "30"))  # seconds to wait for network TTS (per chunk when streaming)
+    TTS_OFFLINE_WORKERS = int(os.getenv("TTS_OFFLINE_WORKERS", "0"))  # pyttsx3/espeak workers, 0 = one per core
+    TTS_OFFLINE_QUEUE_SIZE = int(os.getenv("TTS_OFFLINE_QUEUE_SIZE", "100"))  # queued offline syntheses
+    TTS_STATS_WINDOW = int(os.getenv("TTS_STATS_WINDOW", "50"))  # latency samples kept per engine
+    TTS_BREAKER_FAILURES = int(os.getenv("TTS_BREAKER_FAILURES", "3"))  # consecutive failures that open a breaker
+    TTS_BREAKER_COOLDOWN = float(os.getenv("TTS_BREAKER_COOLDOWN", "60"))  # seconds a failing engine is skipped
+    TTS_PREFERENCE_PENALTY = float(os.getenv("TTS_PREFERENCE_PENALTY", "0.5"))  # seconds per step down the quality order
+    TTS_SENTENCE_WORKERS = int(os.getenv("TTS_SENTENCE_WORKERS", "4"))  # sentences synthesized concurrently
+    TTS_MIN_SENTENCE_CHARS = int(os.getenv("TTS_MIN_SENTENCE_CHARS", "20"))  # shorter fragments join a neighbour
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # in-memory LRU budget
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")  # disk tier folder, empty = memory only
+    TTS_CACHE_DISK_MAX_BYTES = int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))  # disk tier budget, oldest evicted first
+    TTS_PRESYNTHESIZE = os.getenv("TTS_PRESYNTHESIZE", "true").lower() == "true"  # render questions after planning
     
     # Evaluation settings
     EVALUATION_TIMEOUT = int(os.getenv("EVALUATION_TIMEOUT", "30"))  # seconds
+    EVALUATION_POLL_INTERVAL = float(os.getenv("EVALUATION_POLL_INTERVAL", "0.5"))  # seconds between shared-session checks
+    EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", "4"))  # background evaluation threads
+    EVALUATION_QUEUE_SIZE = int(os.getenv("EVALUATION_QUEUE_SIZE", "200"))  # max queued answers
+    EVALUATION_BATCH_SIZE = int(os.getenv("EVALUATION_BATCH_SIZE", "5"))  # answers per LLM call, 1 = no batching
+    EVALUATION_BATCH_WINDOW_MS = int(os.getenv("EVALUATION_BATCH_WINDOW_MS", "50"))  # wait to fill a batch
+    
+    # Background pipeline jobs (resume analysis)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # concurrent resume analyses
+    JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "50"))  # max queued analyses
+    JOB_TTL = int(os.getenv("JOB_TTL", "3600"))  # seconds a finished job stays pollable
+    
+    # Session store settings
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "file").lower()  # file, sqlite (shared across workers)
+    SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "session_data/sessions.db")
+    SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "500"))  # hot sessions kept in memory
+    SESSION_FLUSH_INTERVAL = float(os.getenv("SESSION_FLUSH_INTERVAL", "2.0"))  # seconds, 0 = write-through
     
     # Interview settings
     QUESTION_TIMEOUT = int(os.getenv("QUESTION_TIMEOUT", "120"))  # seconds
@@ -51,4 +117,5 @@ class Config:
     SILENCE_THRESHOLD = float(os.getenv("SILENCE_THRESHOLD", "300"))  # RMS value
     MAX_RECORDING_TIME = float(os.getenv("MAX_RECORDING_TIME", "60.0"))  # seconds
     AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))  # Hz
+    AUDIO_DECODE_TIMEOUT = float(os.getenv("AUDIO_DECODE_TIMEOUT", "30"))  # seconds for one ffmpeg decode
     AUDIO_CHUNK_SIZE = int(os.getenv("AUDIO_CHUNK_SIZE", "1024"))  # bytes
\ No newline at end of file
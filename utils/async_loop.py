@@ -0,0 +1,121 @@
+# Long-lived asyncio event loop shared by the async LLM (and other I/O) clients
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+
+from utils.safe_threading import thread_manager
+
+_EXHAUSTED = object()
+CANCEL_GRACE = 5.0  # seconds a timed-out coroutine gets to unwind after cancellation
+
+
+async def _anext_or_exhausted(agen):
+    """Advance an async generator, returning a sentinel instead of raising StopAsyncIteration"""
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _EXHAUSTED
+
+
+class BackgroundEventLoop:
+    """Runs one asyncio event loop in a daemon thread and accepts work from any thread"""
+
+    def __init__(self, name="background-loop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        atexit.register(self.stop)
+
+    def _run(self):
+        """Thread target: own the event loop until stop() is called"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def _ensure_started(self):
+        """Start the loop thread on first use"""
+        if self._loop is not None and self._loop.is_running():
+            return self._loop
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._ready.clear()
+                self._thread = thread_manager.start_thread(self._run)
+                self._thread.name = self.name
+                self._ready.wait()
+                print(f"✅ Background event loop '{self.name}' started")
+        return self._loop
+
+    @property
+    def loop(self):
+        return self._ensure_started()
+
+    def is_current(self):
+        """True when called from inside this loop's thread"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block the calling thread for its result"""
+        if self.is_current():
+            coro.close()
+            raise RuntimeError(f"Cannot block on '{self.name}' from inside its own thread")
+        if timeout is None:
+            return self.submit(coro).result()
+        # wait_for cancels the coroutine on the loop and waits for it to unwind before
+        # raising, so a hung request does not keep running after the caller gave up
+        future = self.submit(asyncio.wait_for(coro, timeout))
+        try:
+            return future.result(timeout + CANCEL_GRACE)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(self, agen, timeout=None):
+        """Drive an async generator on the loop and yield its items to a blocking caller"""
+        try:
+            while True:
+                item = self.run(_anext_or_exhausted(agen), timeout)
+                if item is _EXHAUSTED:
+                    break
+                yield item
+        finally:
+            # Runs on normal exhaustion and when the consumer stops early (e.g. client disconnect).
+            # A timed-out step has already been cancelled and unwound, so the generator is idle here.
+            try:
+                self.run(agen.aclose(), CANCEL_GRACE)
+            except Exception as e:
+                print(f"⚠️ Could not close async generator on '{self.name}': {e}")
+
+    async def run_async(self, coro):
+        """Await a coroutine on this loop from any event loop"""
+        if self.is_current():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self):
+        """Stop the loop and let its thread exit"""
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=2.0)
+
+
+# Global background loop
+background_loop = BackgroundEventLoop()
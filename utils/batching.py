@@ -0,0 +1,27 @@
+# Micro-batch collection shared by the queue-backed worker pools
+import queue
+import time
+
+
+def collect_batch(jobs, max_size, max_wait, poll_timeout=0.5):
+    """Take jobs from a queue.Queue for one batch
+
+    Blocks up to poll_timeout for the first job (returning [] if none arrives, so worker
+    loops can check for shutdown), then keeps taking jobs for up to max_wait seconds or
+    until max_size jobs are collected.
+    """
+    try:
+        batch = [jobs.get(timeout=poll_timeout)]
+    except queue.Empty:
+        return []
+
+    deadline = time.perf_counter() + max_wait
+    while len(batch) < max_size:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(jobs.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
@@ -0,0 +1,147 @@
+# Compare speech-to-text backends on a local corpus: real-time factor and word error rate
+#
+#   python -m utils.benchmark_stt --corpus samples/ --backends whisper,whisper-int8,faster-whisper
+#
+# The corpus is a folder of audio files (wav, webm, ogg, mp3, flac, m4a), each with a
+# reference transcript next to it under the same name with a .txt extension.
+import argparse
+import os
+import re
+import time
+
+from config import Config
+from utils.stt_backends import STT_BACKENDS
+
+AUDIO_EXTENSIONS = ('.wav', '.webm', '.ogg', '.mp3', '.flac', '.m4a')
+
+
+def load_corpus(folder):
+    """[(name, audio_bytes, reference_text)] for every audio file with a reference transcript"""
+    corpus = []
+    for filename in sorted(os.listdir(folder)):
+        base, ext = os.path.splitext(filename)
+        if ext.lower() not in AUDIO_EXTENSIONS:
+            continue
+        reference_path = os.path.join(folder, base + '.txt')
+        if not os.path.exists(reference_path):
+            print(f"⚠️ Skipping {filename}: no {base}.txt reference")
+            continue
+        with open(os.path.join(folder, filename), 'rb') as f:
+            audio_bytes = f.read()
+        with open(reference_path, 'r', encoding='utf-8') as f:
+            reference = f.read()
+        corpus.append((filename, audio_bytes, reference))
+    return corpus
+
+
+def normalize_words(text):
+    """Lowercase words without punctuation"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level Levenshtein distance (substitutions + deletions + insertions)"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def decode_corpus(stt, corpus):
+    """Decode every file once so all backends are timed on the same samples, excluding decode time"""
+    samples = []
+    for name, audio_bytes, reference in corpus:
+        audio_np = stt.decode_audio_bytes(audio_bytes)
+        if audio_np is None:
+            print(f"⚠️ Skipping {name}: could not decode audio")
+            continue
+        samples.append((name, audio_np, reference))
+    print(f"📁 {len(samples)} sample(s) decoded")
+    return samples
+
+
+def benchmark_backend(backend, model_name, corpus, samples, language=None):
+    """Transcribe every decoded sample with one backend; returns a result row
+
+    `samples` is filled from `corpus` by the first backend that loads.
+    """
+    from utils.speech_to_text_whisper import WebMCompatibleSpeechToText
+
+    load_start = time.perf_counter()
+    stt = WebMCompatibleSpeechToText(model_name, backend=backend)
+    load_seconds = time.perf_counter() - load_start
+    if not stt.model:
+        return {'backend': backend, 'error': 'model failed to load'}
+    if not samples:
+        samples.extend(decode_corpus(stt, corpus))
+    stt.warmup()
+
+    audio_seconds = transcribe_seconds = 0.0
+    errors = reference_words = 0
+    for name, audio_np, reference in samples:
+        clip = stt.prepare_clip(audio_np)
+        start = time.perf_counter()
+        text = stt.transcribe_clips([clip], [language])[0]['text'] if clip else ''
+        elapsed = time.perf_counter() - start
+
+        ref_words = normalize_words(reference)
+        sample_errors = word_errors(ref_words, normalize_words(text))
+        audio_seconds += len(audio_np) / stt.SAMPLE_RATE
+        transcribe_seconds += elapsed
+        errors += sample_errors
+        reference_words += len(ref_words)
+        print(f"   {backend:<15} {name:<30} {elapsed:6.2f}s  WER {sample_errors / max(1, len(ref_words)):.3f}")
+
+    return {
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'audio_seconds': audio_seconds,
+        'transcribe_seconds': transcribe_seconds,
+        'rtf': transcribe_seconds / audio_seconds if audio_seconds else 0.0,
+        'wer': errors / reference_words if reference_words else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech-to-text backends (RTF and WER)")
+    parser.add_argument('--corpus', required=True, help="Folder of audio files with .txt references")
+    parser.add_argument('--backends', default=','.join(STT_BACKENDS),
+                        help=f"Comma-separated backends (default: {','.join(STT_BACKENDS)})")
+    parser.add_argument('--model', default=Config.WHISPER_MODEL, help="Whisper model size")
+    parser.add_argument('--language', default=None, help="Force a language instead of detecting it")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ No audio files with .txt references found in {args.corpus}")
+        return
+
+    samples = []
+    rows = []
+    for backend in [name.strip() for name in args.backends.split(',') if name.strip()]:
+        if backend not in STT_BACKENDS:
+            print(f"⚠️ Unknown backend '{backend}', skipping")
+            continue
+        if not STT_BACKENDS[backend].available():
+            print(f"⚠️ Backend '{backend}' is not installed, skipping")
+            continue
+        print(f"🔄 Benchmarking {backend} ({args.model})")
+        rows.append(benchmark_backend(backend, args.model, corpus, samples, args.language))
+
+    print()
+    print(f"{'backend':<15} {'load s':>8} {'audio s':>9} {'transcribe s':>13} {'RTF':>7} {'WER':>7}")
+    for row in rows:
+        if 'error' in row:
+            print(f"{row['backend']:<15} {row['error']}")
+            continue
+        print(f"{row['backend']:<15} {row['load_seconds']:8.2f} {row['audio_seconds']:9.2f} "
+              f"{row['transcribe_seconds']:13.2f} {row['rtf']:7.3f} {row['wer']:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
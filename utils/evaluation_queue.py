@@ -0,0 +1,174 @@
+# Background answer evaluation so request handlers never wait on the LLM
+import queue
+import threading
+import time
+
+from config import Config
+from utils.batching import collect_batch
+from utils.safe_threading import thread_manager
+
+PENDING_EVALUATION = {
+    'status': 'pending',
+    'feedback': 'Evaluation in progress...',
+    'suggestions': [],
+    'confidence': 'Pending'
+}
+
+
+def is_pending(evaluation):
+    """True for the placeholder stored while an answer is still being evaluated"""
+    return isinstance(evaluation, dict) and evaluation.get('status') == 'pending'
+
+
+class EvaluationQueue:
+    """Job queue plus worker pool that evaluates answers and reports results via a callback
+
+    Workers micro-batch: after taking a job they keep collecting jobs (from any interview)
+    for up to batch_window_ms or until batch_size is reached, then evaluate them together
+    with evaluate_batch_fn(qa_pairs), which must return one evaluation per pair, in order.
+    """
+
+    def __init__(self, evaluate_fn, evaluate_batch_fn=None, num_workers=None, max_pending=None,
+                 batch_size=None, batch_window_ms=None):
+        self.evaluate_fn = evaluate_fn
+        self.evaluate_batch_fn = evaluate_batch_fn
+        self.batch_size = max(1, batch_size or Config.EVALUATION_BATCH_SIZE)
+        self.batch_window = (batch_window_ms if batch_window_ms is not None else Config.EVALUATION_BATCH_WINDOW_MS) / 1000.0
+        self.num_workers = num_workers or Config.EVALUATION_WORKERS
+        self._queue = queue.Queue(maxsize=max_pending or Config.EVALUATION_QUEUE_SIZE)
+        self._result_handler = None
+        self._pending = {}  # interview_id -> set of question indexes
+        self._condition = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._workers = []
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'batches': 0,
+                       'total_seconds': 0.0}
+
+    def set_result_handler(self, handler):
+        """handler(interview_id, question_index, evaluation) is called from worker threads"""
+        self._result_handler = handler
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._start_lock:
+            if self._workers:
+                return
+            for _ in range(self.num_workers):
+                self._workers.append(thread_manager.start_thread(self._worker_loop))
+            print(f"✅ Evaluation queue started with {self.num_workers} workers")
+
+    def submit(self, interview_id, question_index, question, answer):
+        """Queue an answer for evaluation; returns False when the queue is full"""
+        self.start()
+        with self._condition:
+            try:
+                self._queue.put_nowait((interview_id, question_index, question, answer, time.perf_counter()))
+            except queue.Full:
+                self._stats['rejected'] += 1
+                return False
+            self._pending.setdefault(interview_id, set()).add(question_index)
+            self._stats['submitted'] += 1
+        return True
+
+    def _worker_loop(self):
+        """Pull batches of jobs until shutdown is requested"""
+        while not thread_manager.is_shutdown_requested():
+            batch = collect_batch(self._queue, self.batch_size, self.batch_window)
+            if not batch:
+                continue
+
+            try:
+                self._process_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _process_batch(self, batch):
+        """Evaluate a batch of jobs and hand each result to the result handler"""
+        with self._condition:
+            self._stats['batches'] += 1
+
+        if len(batch) > 1 and self.evaluate_batch_fn:
+            qa_pairs = [{'question': job[2], 'answer': job[3]} for job in batch]
+            try:
+                evaluations = self.evaluate_batch_fn(qa_pairs)
+                if len(evaluations) != len(batch):
+                    raise ValueError(f"expected {len(batch)} evaluations, got {len(evaluations)}")
+                print(f"📦 Evaluated {len(batch)} answers in one batch")
+                for job, evaluation in zip(batch, evaluations):
+                    self._finish(*job, evaluation=evaluation, failed=False)
+                return
+            except Exception as e:
+                print(f"⚠️ Batch evaluation failed, evaluating individually: {e}")
+
+        for job in batch:
+            self._process(*job)
+
+    def _process(self, interview_id, question_index, question, answer, queued_at):
+        """Evaluate one answer and hand the result to the result handler"""
+        try:
+            evaluation = self.evaluate_fn(question, answer)
+            failed = False
+        except Exception as e:
+            error_msg = f"Evaluation failed: {str(e)}"
+            print(f"❌ {error_msg}")
+            evaluation = {
+                'score': 0,
+                'feedback': error_msg,
+                'suggestions': ['Technical issue occurred during evaluation'],
+                'confidence': 'Low'
+            }
+            failed = True
+        self._finish(interview_id, question_index, question, answer, queued_at, evaluation=evaluation, failed=failed)
+
+    def _finish(self, interview_id, question_index, question, answer, queued_at, evaluation, failed):
+        """Store the result and release anyone waiting on this interview"""
+        try:
+            if self._result_handler:
+                self._result_handler(interview_id, question_index, evaluation)
+        except Exception as e:
+            print(f"❌ Could not store evaluation for {interview_id[:8]} Q{question_index + 1}: {e}")
+        finally:
+            self._mark_done(interview_id, question_index, failed, time.perf_counter() - queued_at)
+
+        print(f"✅ Background evaluation done for {interview_id[:8]} Q{question_index + 1}. "
+              f"Score: {evaluation.get('score', 'N/A')}%")
+
+    def _mark_done(self, interview_id, question_index, failed, elapsed):
+        with self._condition:
+            pending = self._pending.get(interview_id)
+            if pending is not None:
+                pending.discard(question_index)
+                if not pending:
+                    del self._pending[interview_id]
+            self._stats['failed' if failed else 'completed'] += 1
+            self._stats['total_seconds'] += elapsed
+            self._condition.notify_all()
+
+    def pending_count(self, interview_id):
+        """Number of answers from this interview still waiting for evaluation"""
+        with self._condition:
+            return len(self._pending.get(interview_id, ()))
+
+    def pending_indexes(self, interview_id):
+        """Question indexes of this interview queued or being evaluated in this process"""
+        with self._condition:
+            return set(self._pending.get(interview_id, ()))
+
+    def wait_for(self, interview_id, timeout=None):
+        """Block until every queued answer of the interview is evaluated; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending.get(interview_id), timeout=timeout)
+
+    def get_stats(self):
+        """Queue depth and throughput counters"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['queued'] = self._queue.qsize()
+            stats['pending_interviews'] = len(self._pending)
+        finished = stats['completed'] + stats['failed']
+        stats['avg_seconds'] = round(stats.pop('total_seconds') / finished, 3) if finished else 0.0
+        stats['avg_batch_size'] = round(finished / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['workers'] = self.num_workers
+        stats['batch_size'] = self.batch_size
+        return stats
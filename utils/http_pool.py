@@ -0,0 +1,140 @@
+# Shared, pooled HTTP transport for LLM providers that speak plain HTTP (Ollama)
+import json
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import aiohttp
+
+from config import Config
+
+
+async def _on_connection_create_start(session, ctx, params):
+    ctx.trace_request_ctx.connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(session, ctx, params):
+    request_ctx = ctx.trace_request_ctx
+    request_ctx.connect = time.perf_counter() - request_ctx.connect_start
+
+
+class PooledHTTPClient:
+    """Keep-alive aiohttp session with timeouts and per-call latency tracking
+
+    The session lives on the event loop it was first used from (the shared background
+    loop). HTTP_POOL_SIZE caps connections per host, HTTP_KEEP_ALIVE=false closes each
+    connection after its response.
+    """
+
+    def __init__(self, pool_size=None, connect_timeout=None, read_timeout=None, keep_alive=None):
+        self.pool_size = pool_size or Config.HTTP_POOL_SIZE
+        self.connect_timeout = connect_timeout or Config.HTTP_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or Config.HTTP_READ_TIMEOUT
+        self.keep_alive = Config.HTTP_KEEP_ALIVE if keep_alive is None else keep_alive
+
+        self._async_session = None
+        self._stats_lock = threading.Lock()
+        self._recent = deque(maxlen=200)
+        self._total_calls = 0
+        self._new_connections = 0
+
+    def _get_async_session(self):
+        """Lazily build the aiohttp session (must be called from the loop that will use it)"""
+        if self._async_session is None or self._async_session.closed:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_start.append(_on_connection_create_start)
+            trace_config.on_connection_create_end.append(_on_connection_create_end)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.pool_size,
+                force_close=not self.keep_alive,
+            )
+            self._async_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout,
+                    sock_read=self.read_timeout,
+                ),
+                trace_configs=[trace_config],
+            )
+        return self._async_session
+
+    async def apost_json(self, url, payload):
+        """Async POST of a JSON payload; returns (status, body_bytes, timing)"""
+        session = self._get_async_session()
+        request_ctx = SimpleNamespace(connect=0.0, connect_start=None)
+
+        start = time.perf_counter()
+        async with session.post(url, json=payload, trace_request_ctx=request_ctx) as response:
+            ttfb = time.perf_counter() - start
+            body = await response.read()
+            status = response.status
+        total = time.perf_counter() - start
+
+        timing = self._record(url, request_ctx.connect, ttfb, total)
+        return status, body, timing
+
+    async def astream_json_lines(self, url, payload):
+        """Async POST that yields each newline-delimited JSON object of a streamed response"""
+        session = self._get_async_session()
+        request_ctx = SimpleNamespace(connect=0.0, connect_start=None)
+
+        start = time.perf_counter()
+        ttfb = None
+        async with session.post(url, json=payload, trace_request_ctx=request_ctx) as response:
+            if response.status != 200:
+                raise Exception(f"HTTP {response.status} from {url}")
+            async for line in response.content:
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        total = time.perf_counter() - start
+        self._record(url, request_ctx.connect, ttfb if ttfb is not None else total, total)
+
+    def _record(self, url, connect, ttfb, total):
+        """Store timing in the rolling stats window"""
+        timing = {
+            "url": url,
+            "connect": round(connect, 4),
+            "ttfb": round(ttfb, 4),
+            "total": round(total, 4),
+            "reused_connection": connect == 0.0,
+        }
+        with self._stats_lock:
+            self._recent.append(timing)
+            self._total_calls += 1
+            if connect > 0.0:
+                self._new_connections += 1
+        return timing
+
+    def get_stats(self):
+        """Aggregate latency stats over the recent call window"""
+        with self._stats_lock:
+            recent = list(self._recent)
+            total_calls = self._total_calls
+            new_connections = self._new_connections
+
+        def _avg(key):
+            return round(sum(t[key] for t in recent) / len(recent), 4) if recent else 0.0
+
+        return {
+            "total_calls": total_calls,
+            "new_connections": new_connections,
+            "connection_reuse_rate": round(1 - new_connections / total_calls, 3) if total_calls else 0.0,
+            "avg_connect": _avg("connect"),
+            "avg_ttfb": _avg("ttfb"),
+            "avg_total": _avg("total"),
+            "pool_size": self.pool_size,
+        }
+
+    async def aclose(self):
+        """Close the aiohttp session (call from the loop that owns it)"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+
+
+# Global pooled HTTP client
+http_client = PooledHTTPClient()
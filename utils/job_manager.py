@@ -0,0 +1,188 @@
+# Background pipeline jobs with stage-by-stage progress reporting
+import queue
+import threading
+import time
+import uuid
+
+from config import Config
+from utils.safe_threading import thread_manager
+
+
+class Job:
+    """One pipeline run; the pipeline calls stage(name) as it moves through its stages"""
+
+    def __init__(self, manager, fn, args, kwargs, stages, owner=None):
+        self.id = str(uuid.uuid4())
+        self.owner = owner
+        self.stages = list(stages)
+        self.status = 'queued'
+        self.current_stage = None
+        self.stage_timings = []  # [{'name', 'seconds'}] of finished stages
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._stage_started = None
+        self._manager = manager
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+
+    def stage(self, name):
+        """Finish the current stage (recording its duration) and enter the next one"""
+        self._close_stage()
+        self.current_stage = name
+        self._stage_started = time.perf_counter()
+        print(f"⏩ Job {self.id[:8]}: {name}")
+        self._manager._report(self)
+
+    def _close_stage(self):
+        if self.current_stage is not None and self._stage_started is not None:
+            seconds = time.perf_counter() - self._stage_started
+            self.stage_timings.append({'name': self.current_stage, 'seconds': round(seconds, 3)})
+            self._manager._record_stage(self.current_stage, seconds)
+        self._stage_started = None
+
+    def progress(self):
+        """Percent complete, counting finished stages"""
+        if self.status == 'completed':
+            return 100
+        if not self.stages:
+            return 0
+        return int(len(self.stage_timings) * 100 / len(self.stages))
+
+    def to_dict(self):
+        """JSON-friendly snapshot for polling clients"""
+        end = self.finished_at or time.time()
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'stage': self.current_stage,
+            'stages': self.stages,
+            'stage_timings': list(self.stage_timings),
+            'progress': self.progress(),
+            'result': self.result,
+            'error': self.error,
+            'elapsed': round(end - (self.started_at or self.created_at), 3),
+        }
+
+
+class JobManager:
+    """Bounded job queue plus worker pool for long pipelines that must not block a request"""
+
+    def __init__(self, num_workers=None, max_pending=None, ttl=None):
+        self.num_workers = num_workers or Config.JOB_WORKERS
+        self.ttl = ttl if ttl is not None else Config.JOB_TTL
+        self._queue = queue.Queue(maxsize=max_pending or Config.JOB_QUEUE_SIZE)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._workers = []
+        self._progress_handler = None
+        self._stage_stats = {}  # stage -> {'count', 'total_seconds', 'max_seconds'}
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+
+    def set_progress_handler(self, handler):
+        """handler(job) is called from worker threads whenever a job changes stage or finishes"""
+        self._progress_handler = handler
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._start_lock:
+            if self._workers:
+                return
+            for _ in range(self.num_workers):
+                self._workers.append(thread_manager.start_thread(self._worker_loop))
+            print(f"✅ Job manager started with {self.num_workers} workers")
+
+    def submit(self, fn, args=(), kwargs=None, stages=(), owner=None):
+        """Queue fn(job, *args, **kwargs); returns the Job, or None when the queue is full"""
+        self.start()
+        self._prune()
+        job = Job(self, fn, args, kwargs or {}, stages, owner=owner)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._stats['rejected'] += 1
+                return None
+            self._jobs[job.id] = job
+            self._stats['submitted'] += 1
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _worker_loop(self):
+        """Run jobs until shutdown is requested"""
+        while not thread_manager.is_shutdown_requested():
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job):
+        job.status = 'running'
+        job.started_at = time.time()
+        self._report(job)
+        try:
+            job.result = job._fn(job, *job._args, **job._kwargs)
+            job._close_stage()
+            job.status = 'completed'
+        except Exception as e:
+            job._close_stage()
+            job.error = str(e)
+            job.status = 'failed'
+            print(f"❌ Job {job.id[:8]} failed: {e}")
+        job.finished_at = time.time()
+        with self._lock:
+            self._stats[job.status] += 1
+        self._report(job)
+        print(f"✅ Job {job.id[:8]} {job.status} in {job.finished_at - job.started_at:.2f}s")
+
+    def _report(self, job):
+        if not self._progress_handler:
+            return
+        try:
+            self._progress_handler(job)
+        except Exception as e:
+            print(f"⚠️ Job progress handler failed: {e}")
+
+    def _record_stage(self, name, seconds):
+        with self._lock:
+            stats = self._stage_stats.setdefault(name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def _prune(self):
+        """Forget finished jobs older than the TTL"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished_at and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def get_stats(self):
+        """Job counters and per-stage timings"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queued'] = self._queue.qsize()
+            stats['running'] = sum(1 for job in self._jobs.values() if job.status == 'running')
+            stats['stages'] = {
+                name: {
+                    'count': s['count'],
+                    'avg_seconds': round(s['total_seconds'] / s['count'], 3) if s['count'] else 0.0,
+                    'max_seconds': round(s['max_seconds'], 3),
+                }
+                for name, s in self._stage_stats.items()
+            }
+        stats['workers'] = self.num_workers
+        return stats
@@ -0,0 +1,209 @@
+# Content-addressed cache for LLM responses (in-memory LRU + optional SQLite tier)
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+
+class LLMResponseCache:
+    """Caches responses keyed on a hash of everything that determines the output"""
+
+    def __init__(self, max_entries=None, ttl=None, db_path=None, enabled=None):
+        self.enabled = Config.LLM_CACHE_ENABLED if enabled is None else enabled
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else Config.LLM_CACHE_TTL
+        self.db_path = db_path if db_path is not None else Config.LLM_CACHE_DB_PATH
+
+        self._memory = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'bytes_saved': 0,
+        }
+
+        if self.enabled and self.db_path:
+            self._open_db()
+
+    @staticmethod
+    def make_key(provider, model, temperature, max_tokens, system_prompt, prompt):
+        """Stable SHA-256 over the generation inputs"""
+        material = json.dumps(
+            [provider, model, temperature, max_tokens, system_prompt or "", prompt],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _open_db(self):
+        """Open (and create) the SQLite tier"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+            print(f"✅ LLM disk cache ready: {self.db_path}")
+        except Exception as e:
+            print(f"⚠️ LLM disk cache disabled: {e}")
+            self._db = None
+
+    def _expiry(self):
+        return time.time() + self.ttl if self.ttl > 0 else 0.0
+
+    @staticmethod
+    def _is_expired(expires_at):
+        return expires_at and expires_at < time.time()
+
+    def get(self, key):
+        """Return a cached response or None"""
+        if not self.enabled:
+            return None
+        response = self._memory_get(key)
+        if response is not None:
+            return response
+        return self._disk_lookup(key)
+
+    async def aget(self, key):
+        """get() for coroutines: the SQLite tier is queried off the event loop"""
+        if not self.enabled:
+            return None
+        response = self._memory_get(key)
+        if response is not None:
+            return response
+        return await asyncio.to_thread(self._disk_lookup, key)
+
+    def set(self, key, response):
+        """Store a response in both tiers"""
+        if not self.enabled or response is None:
+            return
+        expires_at = self._expiry()
+        self._memory_set(key, response, expires_at)
+        self._disk_set(key, response, expires_at)
+        with self._lock:
+            self._stats['stores'] += 1
+
+    async def aset(self, key, response):
+        """set() for coroutines: the SQLite write runs off the event loop"""
+        if not self.enabled or response is None:
+            return
+        expires_at = self._expiry()
+        self._memory_set(key, response, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_set, key, response, expires_at)
+        with self._lock:
+            self._stats['stores'] += 1
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if self._is_expired(expires_at):
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self._stats['memory_hits'] += 1
+            self._stats['bytes_saved'] += len(response.encode("utf-8"))
+            return response
+
+    def _disk_lookup(self, key):
+        """Disk tier lookup; a hit is promoted to memory with its stored expiry"""
+        row = self._disk_get(key)
+        if row is not None:
+            response, expires_at = row
+            self._memory_set(key, response, expires_at)
+            with self._lock:
+                self._stats['disk_hits'] += 1
+                self._stats['bytes_saved'] += len(response.encode("utf-8"))
+            return response
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def _memory_set(self, key, response, expires_at):
+        with self._lock:
+            self._memory[key] = (expires_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _disk_get(self, key):
+        """(response, expires_at) from SQLite, or None"""
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                response, expires_at = row
+                if self._is_expired(expires_at):
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    return None
+                return response, expires_at
+        except Exception as e:
+            print(f"⚠️ LLM disk cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key, response, expires_at):
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, response, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, time.time(), expires_at),
+                )
+                self._db.commit()
+        except Exception as e:
+            print(f"⚠️ LLM disk cache write failed: {e}")
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def get_stats(self):
+        """Hit/miss counters and bytes saved"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['disk_tier'] = self._db is not None
+        return stats
+
+
+# Global LLM response cache
+llm_cache = LLMResponseCache()
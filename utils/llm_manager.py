@@ -1,52 +1,162 @@
 # New LLM Manager to handle multiple providers
 import google.generativeai as genai
 import openai
-import requests
+import asyncio
 import json
+import threading
+import time
 from config import Config, LLMProvider
+from utils.async_loop import background_loop
+from utils.http_pool import http_client
+from utils.llm_cache import llm_cache
 
 class LLMManager:
     def __init__(self):
         self.provider = Config.LLM_PROVIDER
+        self._semaphores = None
+        self._in_flight = 0
+        self._last_call = threading.local()
         self._setup_client()
-    
+
     def _setup_client(self):
         """Initialize the appropriate LLM client"""
         if self.provider == LLMProvider.GEMINI:
             genai.configure(api_key=Config.GEMINI_API_KEY)
             self.client = genai.GenerativeModel(Config.GEMINI_MODEL)
             print(f"✅ Gemini {Config.GEMINI_MODEL} initialized")
-            
+
         elif self.provider == LLMProvider.OPENAI:
-            self.client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+            self.client = openai.AsyncOpenAI(api_key=Config.OPENAI_API_KEY)
             print(f"✅ OpenAI {Config.OPENAI_MODEL} initialized")
-            
+
         elif self.provider == LLMProvider.OLLAMA:
             self.client = None  # Ollama uses direct HTTP requests
             print(f"✅ Ollama {Config.OLLAMA_MODEL} initialized")
-    
-    def generate_response(self, prompt, system_prompt=None):
-        """Generate response using the configured LLM provider"""
-        try:
-            if self.provider == LLMProvider.GEMINI:
-                return self._generate_gemini(prompt, system_prompt)
-            elif self.provider == LLMProvider.OPENAI:
-                return self._generate_openai(prompt, system_prompt)
-            elif self.provider == LLMProvider.ANTHROPIC:
-                return self._generate_anthropic(prompt, system_prompt)
-            elif self.provider == LLMProvider.GROQ:
-                return self._generate_groq(prompt, system_prompt)
-            elif self.provider == LLMProvider.OLLAMA:
-                return self._generate_ollama(prompt, system_prompt)
-        except Exception as e:
-            print(f"❌ LLM Error: {e}")
-            return f"Error generating response: {str(e)}"
-    
-    def _generate_gemini(self, prompt, system_prompt=None):
+
+    def _get_semaphores(self):
+        """Global and per-provider limits, created on the background loop that uses them"""
+        if self._semaphores is None:
+            provider_limits = {
+                LLMProvider.GEMINI: Config.GEMINI_MAX_CONCURRENCY,
+                LLMProvider.OPENAI: Config.OPENAI_MAX_CONCURRENCY,
+                LLMProvider.OLLAMA: Config.OLLAMA_MAX_CONCURRENCY,
+            }
+            self._semaphores = (
+                asyncio.Semaphore(Config.LLM_MAX_CONCURRENCY),
+                asyncio.Semaphore(provider_limits.get(self.provider, Config.LLM_MAX_CONCURRENCY)),
+            )
+        return self._semaphores
+
+    def _model_name(self):
+        """Model identifier for the configured provider"""
+        return {
+            LLMProvider.GEMINI: Config.GEMINI_MODEL,
+            LLMProvider.OPENAI: Config.OPENAI_MODEL,
+            LLMProvider.OLLAMA: Config.OLLAMA_MODEL,
+        }.get(self.provider)
+
+    def _cache_key(self, prompt, system_prompt=None):
+        return llm_cache.make_key(self.provider.value, self._model_name(), Config.TEMPERATURE,
+                                  Config.MAX_TOKENS, system_prompt, prompt)
+
+    def generate_response(self, prompt, system_prompt=None, use_cache=True):
+        """Generate response using the configured LLM provider (blocking wrapper)
+
+        Set use_cache=False when a fresh, non-deterministic sample is wanted.
+        """
+        text, timing = background_loop.run(self._generate_bounded(prompt, system_prompt, use_cache))
+        self._last_call.timing = timing
+        return text
+
+    async def agenerate_response(self, prompt, system_prompt=None, use_cache=True):
+        """Generate response asynchronously; safe to await from any event loop"""
+        text, timing = await background_loop.run_async(self._generate_bounded(prompt, system_prompt, use_cache))
+        return text
+
+    async def _generate_bounded(self, prompt, system_prompt=None, use_cache=True):
+        """Run one generation under the global and per-provider concurrency limits"""
+        timing = {'provider': self.provider.value}
+
+        cache_key = self._cache_key(prompt, system_prompt) if use_cache and llm_cache.enabled else None
+        if cache_key:
+            cached = await llm_cache.aget(cache_key)
+            if cached is not None:
+                timing['cache'] = 'hit'
+                return cached, timing
+            timing['cache'] = 'miss'
+
+        global_limit, provider_limit = self._get_semaphores()
+        queued_at = time.perf_counter()
+
+        async with global_limit, provider_limit:
+            started_at = time.perf_counter()
+            timing['queue_wait'] = round(started_at - queued_at, 4)
+            self._in_flight += 1
+            try:
+                if self.provider == LLMProvider.GEMINI:
+                    text = await self._generate_gemini(prompt, system_prompt)
+                elif self.provider == LLMProvider.OPENAI:
+                    text = await self._generate_openai(prompt, system_prompt)
+                elif self.provider == LLMProvider.OLLAMA:
+                    text, http_timing = await self._generate_ollama(prompt, system_prompt)
+                    timing.update(http_timing)
+                else:
+                    raise ValueError(f"Unsupported LLM provider: {self.provider}")
+                if cache_key:
+                    await llm_cache.aset(cache_key, text)
+            except Exception as e:
+                print(f"❌ LLM Error: {e}")
+                text = f"Error generating response: {str(e)}"
+            finally:
+                self._in_flight -= 1
+            timing['generation'] = round(time.perf_counter() - started_at, 4)
+
+        return text, timing
+
+    def stream_response(self, prompt, system_prompt=None, use_cache=True):
+        """Yield response text chunks as the provider produces them (blocking generator)
+
+        Errors are raised to the caller; a fully streamed response is stored in the cache.
+        """
+        yield from background_loop.iterate(self._stream_bounded(prompt, system_prompt, use_cache))
+
+    async def _stream_bounded(self, prompt, system_prompt=None, use_cache=True):
+        """Async generator behind stream_response, holding the concurrency slots while streaming"""
+        cache_key = self._cache_key(prompt, system_prompt) if use_cache and llm_cache.enabled else None
+        if cache_key:
+            cached = await llm_cache.aget(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        global_limit, provider_limit = self._get_semaphores()
+        async with global_limit, provider_limit:
+            self._in_flight += 1
+            try:
+                if self.provider == LLMProvider.GEMINI:
+                    chunks = self._stream_gemini(prompt, system_prompt)
+                elif self.provider == LLMProvider.OPENAI:
+                    chunks = self._stream_openai(prompt, system_prompt)
+                elif self.provider == LLMProvider.OLLAMA:
+                    chunks = self._stream_ollama(prompt, system_prompt)
+                else:
+                    raise ValueError(f"Unsupported LLM provider: {self.provider}")
+
+                parts = []
+                async for chunk in chunks:
+                    if chunk:
+                        parts.append(chunk)
+                        yield chunk
+                if cache_key:
+                    await llm_cache.aset(cache_key, "".join(parts))
+            finally:
+                self._in_flight -= 1
+
+    async def _generate_gemini(self, prompt, system_prompt=None):
         """Generate response using Google Gemini"""
         full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        
-        response = self.client.generate_content(
+
+        response = await self.client.generate_content_async(
             full_prompt,
             generation_config=genai.types.GenerationConfig(
                 temperature=Config.TEMPERATURE,
@@ -54,69 +164,115 @@ class LLMManager:
             )
         )
         return response.text
-    
-    def _generate_openai(self, prompt, system_prompt=None):
+
+    async def _generate_openai(self, prompt, system_prompt=None):
         """Generate response using OpenAI"""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        
-        response = self.client.chat.completions.create(
+
+        response = await self.client.chat.completions.create(
             model=Config.OPENAI_MODEL,
             messages=messages,
             temperature=Config.TEMPERATURE,
             max_tokens=Config.MAX_TOKENS
         )
         return response.choices[0].message.content
-    
-    def _generate_anthropic(self, prompt, system_prompt=None):
-        """Generate response using Anthropic Claude"""
-        response = self.client.messages.create(
-            model=Config.ANTHROPIC_MODEL,
-            max_tokens=Config.MAX_TOKENS,
-            temperature=Config.TEMPERATURE,
-            system=system_prompt or "You are a helpful AI assistant.",
-            messages=[{"role": "user", "content": prompt}]
+
+    async def _generate_ollama(self, prompt, system_prompt=None):
+        """Generate response using Ollama over the pooled HTTP client"""
+        url = f"{Config.OLLAMA_BASE_URL}/api/generate"
+
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+
+        payload = {
+            "model": Config.OLLAMA_MODEL,
+            "prompt": full_prompt,
+            "stream": False,
+            "options": {
+                "temperature": Config.TEMPERATURE,
+                "num_predict": Config.MAX_TOKENS
+            }
+        }
+
+        status, body, timing = await http_client.apost_json(url, payload)
+        print(f"⏱️ Ollama latency: connect={timing['connect']:.3f}s "
+              f"ttfb={timing['ttfb']:.3f}s total={timing['total']:.3f}s")
+        if status == 200:
+            return json.loads(body)["response"], timing
+        else:
+            raise Exception(f"Ollama API error: {status}")
+
+    async def _stream_gemini(self, prompt, system_prompt=None):
+        """Stream response chunks from Google Gemini"""
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+
+        response = await self.client.generate_content_async(
+            full_prompt,
+            generation_config=genai.types.GenerationConfig(
+                temperature=Config.TEMPERATURE,
+                max_output_tokens=Config.MAX_TOKENS,
+            ),
+            stream=True
         )
-        return response.content[0].text
-    
-    def _generate_groq(self, prompt, system_prompt=None):
-        """Generate response using Groq"""
+        async for chunk in response:
+            yield chunk.text
+
+    async def _stream_openai(self, prompt, system_prompt=None):
+        """Stream response chunks from OpenAI"""
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
-        
-        response = self.client.chat.completions.create(
-            model=Config.GROQ_MODEL,
+
+        stream = await self.client.chat.completions.create(
+            model=Config.OPENAI_MODEL,
             messages=messages,
             temperature=Config.TEMPERATURE,
-            max_tokens=Config.MAX_TOKENS
+            max_tokens=Config.MAX_TOKENS,
+            stream=True
         )
-        return response.choices[0].message.content
-    
-    def _generate_ollama(self, prompt, system_prompt=None):
-        """Generate response using Ollama (existing implementation)"""
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_ollama(self, prompt, system_prompt=None):
+        """Stream response chunks from Ollama"""
         url = f"{Config.OLLAMA_BASE_URL}/api/generate"
-        
+
         full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        
+
         payload = {
             "model": Config.OLLAMA_MODEL,
             "prompt": full_prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": Config.TEMPERATURE,
                 "num_predict": Config.MAX_TOKENS
             }
         }
-        
-        response = requests.post(url, json=payload)
-        if response.status_code == 200:
-            return response.json()["response"]
-        else:
-            raise Exception(f"Ollama API error: {response.status_code}")
+
+        async for message in http_client.astream_json_lines(url, payload):
+            if message.get("error"):
+                raise Exception(f"Ollama API error: {message['error']}")
+            yield message.get("response", "")
+            if message.get("done"):
+                break
+
+    def last_call_timing(self):
+        """Latency breakdown of this thread's last blocking generate_response call"""
+        return getattr(self._last_call, 'timing', None)
+
+    def get_stats(self):
+        """Transport and concurrency statistics for monitoring"""
+        return {
+            'provider': self.provider.value,
+            'in_flight': self._in_flight,
+            'max_concurrency': Config.LLM_MAX_CONCURRENCY,
+            'http': http_client.get_stats(),
+            'cache': llm_cache.get_stats()
+        }
 
 # Global LLM instance
 llm_manager = LLMManager()
@@ -0,0 +1,79 @@
+# Per-request peak RSS measurement from /proc (Linux only)
+import threading
+
+CLEAR_REFS_PATH = "/proc/self/clear_refs"
+STATUS_PATH = "/proc/self/status"
+
+
+def reset_peak_rss():
+    """Reset the process's peak RSS (VmHWM) to its current RSS; False where unsupported"""
+    try:
+        with open(CLEAR_REFS_PATH, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def read_rss_kb():
+    """(current RSS, peak RSS) in kB from /proc/self/status, or (None, None)"""
+    current = peak = None
+    try:
+        with open(STATUS_PATH) as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return current, peak
+
+
+class PeakRSSTracker:
+    """Peak RSS growth per request, grouped by a label (e.g. upload format)
+
+    The high-water mark is process-wide, so requests measured at the same time
+    see each other's allocations; use it to compare paths under light load.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}  # label -> {'count', 'total_kb', 'max_kb'}
+        self.supported = None
+
+    def start(self):
+        """Reset the high-water mark; returns the RSS baseline in kB (None if unsupported)"""
+        if self.supported is False:
+            return None
+        self.supported = reset_peak_rss()
+        if not self.supported:
+            print("⚠️ Peak RSS measurement not supported on this system")
+            return None
+        return read_rss_kb()[0]
+
+    def finish(self, label, baseline):
+        """Record how far the peak rose above the baseline; returns the growth in kB"""
+        if baseline is None:
+            return None
+        peak = read_rss_kb()[1]
+        if peak is None:
+            return None
+        growth = max(0, peak - baseline)
+        with self._lock:
+            stats = self._stats.setdefault(label, {'count': 0, 'total_kb': 0, 'max_kb': 0})
+            stats['count'] += 1
+            stats['total_kb'] += growth
+            stats['max_kb'] = max(stats['max_kb'], growth)
+        return growth
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                label: {
+                    'count': s['count'],
+                    'avg_peak_growth_mb': round(s['total_kb'] / s['count'] / 1024, 2) if s['count'] else 0.0,
+                    'max_peak_growth_mb': round(s['max_kb'] / 1024, 2),
+                }
+                for label, s in self._stats.items()
+            }
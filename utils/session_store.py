@@ -0,0 +1,469 @@
+# In-process interview session store with write-behind persistence and pluggable backends
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+from utils.safe_threading import thread_manager
+
+
+class SessionConflictError(Exception):
+    """Raised when a session changed in the backend since this process last read it"""
+
+
+class FileSessionBackend:
+    """One pickle file per session, replaced atomically on every write
+
+    Local to one process: versions are not tracked, so it must not be shared between workers.
+    """
+
+    shared = False
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, session_id):
+        return os.path.join(self.folder, f"{session_id}.pkl")
+
+    def load(self, session_id):
+        """Return (data, version) or None; file sessions carry no version"""
+        path = self._path(session_id)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return pickle.load(f), None
+
+    def get_version(self, session_id):
+        return None
+
+    def save_bytes(self, session_id, payload):
+        """Write pickled data to a temp file in the same folder, fsync, then rename over the target"""
+        fd, temp_path = tempfile.mkstemp(dir=self.folder, prefix=f".{session_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._path(session_id))
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def save(self, session_id, data, expected_version=None):
+        self.save_bytes(session_id, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        return None
+
+    def delete(self, session_id):
+        path = self._path(session_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class SQLiteSessionBackend:
+    """Sessions in a WAL-mode SQLite database that several worker processes can share
+
+    Scalar fields are one JSON row per session; questions, answers and evaluations are
+    stored one row per item, so appending an answer writes a single row instead of the
+    whole session. Every write bumps the session version; save() with an expected_version
+    fails with SessionConflictError when another writer got there first.
+    """
+
+    shared = True
+    ITEM_KINDS = ('questions', 'answers', 'evaluations')
+
+    def __init__(self, db_path, max_snapshots=None):
+        self.db_path = db_path
+        self.max_snapshots = max_snapshots or Config.SESSION_CACHE_SIZE
+        # session_id -> (version, {kind: [item hash]}) as last read or written by this process
+        self._snapshots = OrderedDict()
+        self._db_lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS session_items ("
+            " session_id TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (session_id, kind, idx)) WITHOUT ROWID"
+        )
+        print(f"✅ SQLite session backend ready: {db_path}")
+
+    @staticmethod
+    def _item_hash(value_json):
+        """Stable digest of a serialized item; decides whether its row is rewritten"""
+        return hashlib.sha1(value_json.encode("utf-8")).hexdigest()
+
+    def _remember(self, session_id, version, item_hashes):
+        self._snapshots[session_id] = (version, item_hashes)
+        self._snapshots.move_to_end(session_id)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+
+    def load(self, session_id):
+        """Return (data, version) or None"""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT version, data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            items = self._db.execute(
+                "SELECT kind, value FROM session_items WHERE session_id = ? ORDER BY kind, idx",
+                (session_id,)
+            ).fetchall()
+
+            version, fields = row
+            data = json.loads(fields)
+            item_hashes = {kind: [] for kind in self.ITEM_KINDS}
+            for kind in self.ITEM_KINDS:
+                data[kind] = []
+            for kind, value in items:
+                data.setdefault(kind, []).append(json.loads(value))
+                item_hashes.setdefault(kind, []).append(self._item_hash(value))
+            self._remember(session_id, version, item_hashes)
+        return data, version
+
+    def get_version(self, session_id):
+        """Current version in the database, or None if the session does not exist"""
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id, data, expected_version=None):
+        """Write a session and return its new version
+
+        expected_version=None overwrites unconditionally; 0 means "must not exist yet".
+        Only item rows that differ from this process's last snapshot are written.
+        """
+        fields = json.dumps({k: v for k, v in data.items() if k not in self.ITEM_KINDS}, ensure_ascii=False)
+        items = {kind: [json.dumps(value, ensure_ascii=False) for value in (data.get(kind) or [])]
+                 for kind in self.ITEM_KINDS}
+
+        with self._db_lock:
+            cursor = self._db.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                row = cursor.execute(
+                    "SELECT version FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                current = row[0] if row else 0
+                if expected_version is not None and current != expected_version:
+                    raise SessionConflictError(
+                        f"session {session_id[:8]} is at version {current}, expected {expected_version}"
+                    )
+                new_version = current + 1
+                cursor.execute(
+                    "INSERT INTO sessions (session_id, version, data, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(session_id) DO UPDATE SET version = excluded.version, "
+                    "data = excluded.data, updated_at = excluded.updated_at",
+                    (session_id, new_version, fields, time.time())
+                )
+
+                snapshot = self._snapshots.get(session_id)
+                old_hashes = snapshot[1] if snapshot and snapshot[0] == current else None
+                item_hashes = {}
+                for kind, values in items.items():
+                    hashes = [self._item_hash(value) for value in values]
+                    item_hashes[kind] = hashes
+                    previous = old_hashes.get(kind) if old_hashes is not None else None
+                    if previous is None:
+                        cursor.execute("DELETE FROM session_items WHERE session_id = ? AND kind = ?",
+                                       (session_id, kind))
+                        changed = range(len(values))
+                    else:
+                        if len(previous) > len(values):
+                            cursor.execute(
+                                "DELETE FROM session_items WHERE session_id = ? AND kind = ? AND idx >= ?",
+                                (session_id, kind, len(values))
+                            )
+                        changed = [i for i, h in enumerate(hashes) if i >= len(previous) or previous[i] != h]
+                    cursor.executemany(
+                        "INSERT OR REPLACE INTO session_items (session_id, kind, idx, value) VALUES (?, ?, ?, ?)",
+                        [(session_id, kind, i, values[i]) for i in changed]
+                    )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                self._snapshots.pop(session_id, None)
+                raise
+            self._remember(session_id, new_version, item_hashes)
+        return new_version
+
+    def delete(self, session_id):
+        with self._db_lock:
+            cursor = self._db.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("DELETE FROM session_items WHERE session_id = ?", (session_id,))
+                cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            self._snapshots.pop(session_id, None)
+
+
+def create_session_backend(folder):
+    """Build the backend selected by Config.SESSION_BACKEND"""
+    if Config.SESSION_BACKEND == "sqlite":
+        return SQLiteSessionBackend(Config.SESSION_DB_PATH)
+    return FileSessionBackend(folder)
+
+
+class SessionStore:
+    """LRU cache of hot sessions in front of a backend, with dirty tracking and batched flushing
+
+    Session dicts are handed out by reference. Mutate them only while holding lock(session_id)
+    and call put() afterwards so the change is scheduled for the next flush, or use update().
+
+    With a shared backend (several worker processes) writes go straight through, cached
+    copies are revalidated against the backend version on every read, and update() retries
+    its read-modify-write cycle when another process wins the race.
+    """
+
+    def __init__(self, backend, max_sessions=None, flush_interval=None):
+        self.backend = backend
+        self.shared = getattr(backend, 'shared', False)
+        self.max_sessions = max_sessions or Config.SESSION_CACHE_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else Config.SESSION_FLUSH_INTERVAL
+
+        self._cache = OrderedDict()  # session_id -> data
+        self._versions = {}  # session_id -> backend version of the cached copy
+        self._dirty = set()
+        self._lock = threading.Lock()  # guards _cache, _versions and _dirty
+        self._flush_lock = threading.Lock()  # serializes writes to the backend
+        self._session_locks = {}
+        self._session_locks_guard = threading.Lock()
+        self._flusher = None
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'flushes': 0, 'evictions': 0, 'write_errors': 0,
+                       'conflicts': 0}
+
+    def lock(self, session_id):
+        """Per-session lock guarding read-modify-write cycles"""
+        with self._session_locks_guard:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = self._session_locks[session_id] = threading.RLock()
+            return lock
+
+    def start(self):
+        """Start the background flusher (idempotent)"""
+        if self._flusher is None and self.flush_interval > 0 and not self.shared:
+            self._flusher = thread_manager.start_thread(self._flush_loop)
+
+    def get(self, session_id):
+        """Return the live session dict, loading it from the backend on a miss"""
+        with self._lock:
+            data = self._cache.get(session_id)
+            cached_version = self._versions.get(session_id)
+
+        if data is not None and self.shared and self.backend.get_version(session_id) != cached_version:
+            data = None  # another worker wrote a newer version
+
+        if data is not None:
+            with self._lock:
+                if session_id in self._cache:
+                    self._cache.move_to_end(session_id)
+                self._stats['hits'] += 1
+            return data
+
+        with self._lock:
+            self._stats['misses'] += 1
+
+        loaded = self.backend.load(session_id)
+        if loaded is None:
+            with self._lock:
+                self._cache.pop(session_id, None)
+                self._versions.pop(session_id, None)
+            return None
+        data, version = loaded
+
+        with self._lock:
+            # Another thread may have loaded (and modified) it meanwhile - keep that copy
+            existing = self._cache.get(session_id)
+            if existing is not None and self._versions.get(session_id) == version:
+                return existing
+            self._cache[session_id] = data
+            self._versions[session_id] = version
+        self._evict_overflow()
+        return data
+
+    def put(self, session_id, data):
+        """Store a session dict; written through on shared backends, write-behind otherwise"""
+        if self.shared:
+            with self.lock(session_id):
+                self._write(session_id, data, expected_version=None)
+            self._evict_overflow()
+            return
+
+        with self._lock:
+            self._cache[session_id] = data
+            self._cache.move_to_end(session_id)
+            self._dirty.add(session_id)
+        if self.flush_interval <= 0:
+            self.flush([session_id])
+        self._evict_overflow()
+
+    def update(self, session_id, fn, create=False, retries=5):
+        """Apply fn(data) to a session and save it; returns fn's result
+
+        Missing sessions are skipped (returning None) unless create=True, in which case fn
+        receives an empty dict. On a shared backend a version conflict discards the local
+        copy and replays fn against the fresh data.
+        """
+        with self.lock(session_id):
+            for attempt in range(retries + 1):
+                data = self.get(session_id)
+                if data is None:
+                    if not create:
+                        return None
+                    data = {}
+                result = fn(data)
+
+                if not self.shared:
+                    self.put(session_id, data)
+                    return result
+
+                with self._lock:
+                    expected_version = self._versions.get(session_id) or 0
+                try:
+                    self._write(session_id, data, expected_version=expected_version)
+                    return result
+                except SessionConflictError:
+                    self._discard(session_id)
+                    with self._lock:
+                        self._stats['conflicts'] += 1
+                    if attempt == retries:
+                        raise
+                except Exception:
+                    self._discard(session_id)  # the cached copy holds unsaved changes
+                    raise
+
+    def _discard(self, session_id):
+        """Forget the cached copy so the next read reloads it from the backend"""
+        with self._lock:
+            self._cache.pop(session_id, None)
+            self._versions.pop(session_id, None)
+
+    def _write(self, session_id, data, expected_version):
+        """Write one session through to the backend and cache it at its new version"""
+        with self._flush_lock:
+            version = self.backend.save(session_id, data, expected_version=expected_version)
+        with self._lock:
+            self._cache[session_id] = data
+            self._cache.move_to_end(session_id)
+            self._versions[session_id] = version
+            self._dirty.discard(session_id)
+            self._stats['writes'] += 1
+
+    def delete(self, session_id):
+        """Drop a session from memory and the backend"""
+        with self._lock:
+            self._cache.pop(session_id, None)
+            self._versions.pop(session_id, None)
+            self._dirty.discard(session_id)
+        with self._flush_lock:
+            self.backend.delete(session_id)
+        with self._session_locks_guard:
+            self._session_locks.pop(session_id, None)
+
+    def _evict_overflow(self):
+        """Evict least recently used sessions, flushing dirty ones first"""
+        while True:
+            with self._lock:
+                if len(self._cache) <= self.max_sessions:
+                    return
+                session_id = next(iter(self._cache))
+                needs_flush = session_id in self._dirty
+            if needs_flush:
+                self.flush([session_id], blocking=False)
+            with self._lock:
+                if session_id not in self._dirty and session_id in self._cache:
+                    del self._cache[session_id]
+                    self._versions.pop(session_id, None)
+                    self._stats['evictions'] += 1
+                elif session_id in self._cache:
+                    self._cache.move_to_end(session_id)  # write failed; keep it and retry later
+                    return
+
+    def flush(self, session_ids=None, blocking=True):
+        """Persist dirty sessions (all of them by default); returns the number written
+
+        Lock order is session lock -> flush lock; with blocking=False sessions whose lock is
+        busy are skipped and picked up by a later flush.
+        """
+        with self._lock:
+            targets = list(self._dirty if session_ids is None else self._dirty.intersection(session_ids))
+
+        written = 0
+        for session_id in targets:
+            session_lock = self.lock(session_id)
+            if not session_lock.acquire(blocking=blocking):
+                continue
+            try:
+                with self._flush_lock:
+                    with self._lock:
+                        data = self._cache.get(session_id)
+                        if data is None or session_id not in self._dirty:
+                            continue
+                        self._dirty.discard(session_id)
+                    try:
+                        version = self.backend.save(session_id, data)
+                        with self._lock:
+                            self._versions[session_id] = version
+                        written += 1
+                    except Exception as e:
+                        print(f"❌ Error saving session data: {e}")
+                        with self._lock:
+                            self._dirty.add(session_id)
+                            self._stats['write_errors'] += 1
+            finally:
+                session_lock.release()
+
+        with self._lock:
+            self._stats['writes'] += written
+            if written:
+                self._stats['flushes'] += 1
+        return written
+
+    def _flush_loop(self):
+        """Write-behind loop"""
+        while not thread_manager.is_shutdown_requested():
+            thread_manager.shutdown_event.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Session flush failed: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_sessions'] = len(self._cache)
+            stats['dirty_sessions'] = len(self._dirty)
+        stats['backend'] = type(self.backend).__name__
+        return stats
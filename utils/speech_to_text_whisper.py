@@ -1,29 +1,43 @@
 # utils/speech_to_text_whisper.py - WebM/Opus compatible version
 
-import whisper
+import importlib.util
 import numpy as np
 import io
 import os
-import tempfile
+import shutil
+import subprocess
+import threading
 import time
 
+from config import Config
+from utils.safe_threading import thread_manager
+from utils.stt_backends import get_backend_class
+
+# The model backend (torch/whisper or CTranslate2) and librosa are heavy imports; check they
+# are installed now and import them on first use so the web app can start serving immediately
 try:
-    import whisper
-    WHISPER_AVAILABLE = True
-    print("✅ Whisper imported successfully")
-except ImportError as e:
-    WHISPER_AVAILABLE = False
-    print(f"❌ Whisper not available: {e}")
-
-# Try to import audio processing libraries
-try:
-    import librosa
-    LIBROSA_AVAILABLE = True
+    STT_BACKEND_CLASS = get_backend_class()
+except ValueError as e:
+    STT_BACKEND_CLASS = None
+    print(f"❌ {e}")
+WHISPER_AVAILABLE = STT_BACKEND_CLASS is not None and STT_BACKEND_CLASS.available()
+if WHISPER_AVAILABLE:
+    print(f"✅ Speech backend '{Config.STT_BACKEND}' available (loaded on demand)")
+else:
+    print(f"❌ Speech backend '{Config.STT_BACKEND}' not available")
+
+LIBROSA_AVAILABLE = importlib.util.find_spec("librosa") is not None
+if LIBROSA_AVAILABLE:
     print("✅ Librosa available for audio format conversion")
-except ImportError:
-    LIBROSA_AVAILABLE = False
+else:
     print("⚠️ Librosa not available - limited audio format support")
 
+FFMPEG_PATH = shutil.which("ffmpeg")
+if FFMPEG_PATH:
+    print("✅ FFmpeg available for in-memory audio decoding")
+else:
+    print("⚠️ FFmpeg not available - WebM/MP3 decoding limited")
+
 try:
     import soundfile as sf
     SOUNDFILE_AVAILABLE = True
@@ -32,25 +46,101 @@ except ImportError:
     SOUNDFILE_AVAILABLE = False
     print("⚠️ SoundFile not available")
 
+librosa = None
+
+def _import_librosa():
+    """Import librosa on first use"""
+    global librosa
+    if librosa is None:
+        import librosa as librosa_module
+        librosa = librosa_module
+    return librosa
+
+class _BufferReader(io.RawIOBase):
+    """Read-only file object over an upload buffer
+
+    io.BytesIO copies a bytearray or memoryview up front; this reads straight from it.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        count = max(0, min(len(b), len(self._view) - self._pos))
+        b[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+def _empty_result():
+    return {'text': '', 'language': None, 'language_probability': None}
+
+def _frame_rms(audio_np, frame):
+    """RMS of consecutive non-overlapping frames (a trailing partial frame is ignored)"""
+    usable = len(audio_np) // frame * frame
+    frames = audio_np[:usable].reshape(-1, frame)
+    return np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+
 class WebMCompatibleSpeechToText:
     """
     Speech-to-text that handles WebM/Opus audio from browser MediaRecorder
     """
     
-    def __init__(self, model_name="base"):
+    SAMPLE_RATE = 16000
+    WINDOW_SECONDS = 30.0       # Whisper's fixed input length
+    SPLIT_SEARCH_SECONDS = 8.0  # look this far back from a window's end for a pause to cut at
+    OVERLAP_SECONDS = 1.0       # shared audio between windows cut mid-speech
+    SPLIT_FRAME = 320           # 20ms energy frames for finding pauses
+    VAD_PAD_SECONDS = 0.25      # silence kept around speech when trimming
+    RAW_INTERPRETATIONS = ((np.int16, 32768.0), (np.int32, 2147483648.0), (np.float32, 1.0))
+    RAW_SCORE_FRAME = 512       # samples per frame when scoring headerless PCM
+    RAW_SCORE_FRAMES = 32       # frames sampled across the clip
+    RAW_MAX_FLATNESS = 0.5      # spectral flatness above this is noise-like
+    RAW_ZCR_RANGE = (0.01, 0.35)  # zero crossings per sample typical of speech
+    RAW_SCORE_MARGIN = 1.25     # the chosen reading must be this many times less flat than the runner-up
+    
+    def __init__(self, model_name="base", backend=None):
         self.model = None
+        self.backend = None
         self.model_name = model_name
+        self._stats_lock = threading.Lock()
+        self._stats = {'clips': 0, 'no_speech': 0, 'seconds_in': 0.0, 'seconds_trimmed': 0.0}
+        
+        try:
+            backend_class = get_backend_class(backend)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
         
-        if not WHISPER_AVAILABLE:
-            print("⚠️ Whisper not available - speech-to-text disabled")
+        if not backend_class.available():
+            print(f"⚠️ Speech backend '{backend_class.name}' not available - speech-to-text disabled")
             return
             
         try:
-            print(f"🔄 Loading Whisper model: {model_name}")
-            self.model = whisper.load_model(model_name, device="cpu")
-            print(f"✅ Whisper model '{model_name}' loaded successfully")
+            self.backend = backend_class(model_name)
+            self.model = self.backend.model
         except Exception as e:
             print(f"❌ Failed to load Whisper model: {e}")
+            self.backend = None
             self.model = None
 
     def detect_audio_format(self, audio_bytes):
@@ -74,13 +164,26 @@ class WebMCompatibleSpeechToText:
         else:
             return "unknown"
 
-    def transcribe_audio_data(self, audio_bytes):
+    def transcribe_audio_data(self, audio_bytes, language=None):
         """
         Transcribe audio data from any format supported by browser
         """
+        return self.transcribe_audio_info(audio_bytes, language)['text']
+
+    def transcribe_audio_info(self, audio_bytes, language=None):
+        """
+        Transcribe audio data and report the language used
+
+        Returns {'text', 'language', 'language_probability'}. A language hint (or
+        Config.WHISPER_LANGUAGE) skips detection; language_probability is None then.
+        """
         if not self.model:
             raise Exception("Whisper model not loaded")
         
+        return self._transcribe_numpy_array(self.decode_audio_bytes(audio_bytes), language)
+    
+    def decode_audio_bytes(self, audio_bytes):
+        """Decode browser audio to 16kHz mono float32 (needs no model, safe on any thread)"""
         print(f"🎯 Processing audio data in memory ({len(audio_bytes)} bytes)")
         
         # Detect audio format
@@ -88,18 +191,12 @@ class WebMCompatibleSpeechToText:
         print(f"🔍 Detected audio format: {audio_format}")
         
         try:
-            # Method 1: Try librosa (handles most formats including WebM)
-            if LIBROSA_AVAILABLE:
-                audio_np = self._load_with_librosa(audio_bytes)
-                if audio_np is not None:
-                    return self._transcribe_numpy_array(audio_np)
-            
-            # Method 2: Try temporary file approach (fallback)
-            audio_np = self._load_with_temp_file(audio_bytes)
+            # Decode once, in memory, with the decoder that fits the container
+            audio_np = self._decode_audio(audio_bytes, audio_format)
             if audio_np is not None:
-                return self._transcribe_numpy_array(audio_np)
+                return audio_np
             
-            # Method 3: Last resort - try to process as raw audio
+            # Last resort - try to process as raw audio
             print("⚠️ Trying raw audio processing as last resort...")
             return self._try_raw_audio_processing(audio_bytes)
             
@@ -107,174 +204,332 @@ class WebMCompatibleSpeechToText:
             print(f"❌ All transcription methods failed: {e}")
             raise Exception(f"Could not process audio format '{audio_format}': {e}")
     
-    def _load_with_librosa(self, audio_bytes):
-        """Load audio using librosa (handles WebM, MP3, etc.)"""
-        try:
-            print("🎵 Trying librosa for audio loading...")
-            
-            # Create temporary file for librosa to read
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as temp_file:
-                temp_file.write(audio_bytes)
-                temp_path = temp_file.name
-            
-            try:
-                # Load with librosa
-                audio_np, sample_rate = librosa.load(temp_path, sr=None)
-                print(f"✅ Librosa loaded audio: shape={audio_np.shape}, sr={sample_rate}")
-                
-                # Resample to 16kHz if needed (Whisper expects 16kHz)
-                if sample_rate != 16000:
-                    audio_np = librosa.resample(audio_np, orig_sr=sample_rate, target_sr=16000)
-                    print(f"🔄 Resampled from {sample_rate}Hz to 16000Hz")
-                
+    def _decode_audio(self, audio_bytes, audio_format):
+        """Decode a clip to mono float32 at 16kHz without touching the disk"""
+        if audio_format in ("wav", "ogg", "flac") and SOUNDFILE_AVAILABLE:
+            audio_np = self._load_with_soundfile(audio_bytes)
+            if audio_np is not None:
                 return audio_np
-                
-            finally:
-                # Clean up temp file
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
-                    
+        
+        if FFMPEG_PATH:
+            return self._load_with_ffmpeg(audio_bytes)
+        
+        if LIBROSA_AVAILABLE:
+            return self._load_with_librosa(audio_bytes)
+        
+        return None
+    
+    def _load_with_soundfile(self, audio_bytes):
+        """Decode WAV/OGG/FLAC in memory with libsndfile, reading the upload buffer in place"""
+        try:
+            with _BufferReader(audio_bytes) as audio_file:
+                audio_np, sample_rate = sf.read(audio_file, dtype='float32', always_2d=False)
+            if audio_np.ndim > 1:
+                audio_np = audio_np.mean(axis=1)
+            print(f"✅ SoundFile decoded audio: shape={audio_np.shape}, sr={sample_rate}")
+            return self._resample(audio_np, sample_rate)
         except Exception as e:
-            print(f"⚠️ Librosa method failed: {e}")
+            print(f"⚠️ SoundFile decode failed: {e}")
             return None
     
-    def _load_with_temp_file(self, audio_bytes):
-        """Load audio using temporary file with multiple format attempts"""
+    def _load_with_ffmpeg(self, audio_bytes):
+        """Pipe the clip through ffmpeg (stdin -> 16kHz mono f32le on stdout)"""
+        command = [
+            FFMPEG_PATH, "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "f32le", "-ac", "1", "-ar", "16000",
+            "pipe:1"
+        ]
         try:
-            print("📁 Trying temporary file method...")
-            
-            # Try different extensions
-            extensions = [".webm", ".ogg", ".mp3", ".wav", ".m4a"]
-            
-            for ext in extensions:
-                try:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as temp_file:
-                        temp_file.write(audio_bytes)
-                        temp_path = temp_file.name
-                    
-                    print(f"🧪 Trying extension: {ext}")
-                    
-                    # Try to load with librosa
-                    if LIBROSA_AVAILABLE:
-                        audio_np, sr = librosa.load(temp_path, sr=16000)
-                        print(f"✅ Success with {ext}: shape={audio_np.shape}")
-                        
-                        # Clean up
-                        try:
-                            os.unlink(temp_path)
-                        except:
-                            pass
-                        
-                        return audio_np
-                    
-                    # Clean up if failed
-                    try:
-                        os.unlink(temp_path)
-                    except:
-                        pass
-                        
-                except Exception as e:
-                    print(f"⚠️ Extension {ext} failed: {e}")
-                    continue
-            
+            result = subprocess.run(command, input=audio_bytes, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, timeout=Config.AUDIO_DECODE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            print("⚠️ FFmpeg decode timed out")
             return None
-            
+        
+        if result.returncode != 0 or not result.stdout:
+            print(f"⚠️ FFmpeg decode failed: {result.stderr.decode(errors='ignore').strip()[:200]}")
+            return None
+        
+        audio_np = np.frombuffer(result.stdout, dtype=np.float32)
+        print(f"✅ FFmpeg decoded audio: shape={audio_np.shape}")
+        return audio_np
+    
+    def _load_with_librosa(self, audio_bytes):
+        """Decode in memory with librosa when ffmpeg is not installed"""
+        try:
+            _import_librosa()
+            with _BufferReader(audio_bytes) as audio_file:
+                audio_np, sample_rate = librosa.load(audio_file, sr=None, mono=True)
+            print(f"✅ Librosa loaded audio: shape={audio_np.shape}, sr={sample_rate}")
+            return self._resample(audio_np, sample_rate)
         except Exception as e:
-            print(f"⚠️ Temporary file method failed: {e}")
+            print(f"⚠️ Librosa method failed: {e}")
             return None
     
+    def _resample(self, audio_np, sample_rate):
+        """Resample to 16kHz (Whisper's input rate)"""
+        if sample_rate == 16000:
+            return audio_np
+        if LIBROSA_AVAILABLE:
+            _import_librosa()
+            audio_np = librosa.resample(audio_np, orig_sr=sample_rate, target_sr=16000)
+        else:
+            target_length = int(round(len(audio_np) * 16000 / sample_rate))
+            positions = np.linspace(0, len(audio_np) - 1, target_length)
+            audio_np = np.interp(positions, np.arange(len(audio_np)), audio_np).astype(np.float32)
+        print(f"🔄 Resampled from {sample_rate}Hz to 16000Hz")
+        return audio_np
+    
     def _try_raw_audio_processing(self, audio_bytes):
-        """Last resort: try to interpret as raw audio data"""
+        """Last resort: interpret the bytes as headerless PCM if one reading looks like speech
+
+        Every candidate sample format is scored on a few sampled frames of a zero-copy
+        view; only the most speech-like candidate that passes the thresholds is
+        converted in full and handed to Whisper, so garbage is never decoded.
+
+        int16 PCM read as int32 still looks like (half-rate) speech, while int32 PCM read
+        as int16 never does (every other sample is a noisy low word), so when both pass
+        the data is int16. Any other tie must be won by RAW_SCORE_MARGIN or nothing is used.
+        """
         try:
             print("🔧 Trying raw audio interpretation...")
+            if len(audio_bytes) < 1000:
+                return None
             
-            # Try different interpretations
-            interpretations = [
-                (np.int16, 32768.0),
-                (np.int32, 2147483648.0),
-                (np.float32, 1.0),
-            ]
-            
-            for dtype, scale in interpretations:
-                try:
-                    # Skip if not enough data
-                    if len(audio_bytes) < 1000:
-                        continue
-                    
-                    # Try to interpret as this data type
-                    audio_np = np.frombuffer(audio_bytes, dtype=dtype).astype(np.float32)
-                    
-                    if dtype != np.float32:
-                        audio_np = audio_np / scale
-                    
-                    # Check if data looks reasonable
-                    if len(audio_np) > 1000 and np.max(np.abs(audio_np)) > 0.001:
-                        print(f"✅ Raw interpretation successful: {dtype}, shape={audio_np.shape}")
-                        return self._transcribe_numpy_array(audio_np)
-                
-                except Exception as e:
-                    print(f"⚠️ Raw interpretation {dtype} failed: {e}")
+            passing = []  # (flatness, view, scale)
+            for dtype, scale in self.RAW_INTERPRETATIONS:
+                count = len(audio_bytes) // np.dtype(dtype).itemsize
+                view = np.frombuffer(audio_bytes, dtype=dtype, count=count)
+                score = self._score_raw_candidate(view, scale)
+                if score is None:
+                    print(f"⚠️ Raw interpretation {np.dtype(dtype).name} does not look like audio")
                     continue
+                flatness, zcr, rms = score
+                print(f"🔎 Raw {np.dtype(dtype).name}: flatness={flatness:.2f}, zcr={zcr:.3f}, rms={rms:.4f}")
+                if flatness <= self.RAW_MAX_FLATNESS and self.RAW_ZCR_RANGE[0] <= zcr <= self.RAW_ZCR_RANGE[1]:
+                    passing.append((flatness, view, scale))
             
-            return ""
+            if not passing:
+                print("🔇 No raw interpretation looks like speech, skipping Whisper")
+                return None
+            
+            dtypes = {candidate[1].dtype for candidate in passing}
+            if np.dtype(np.int16) in dtypes and np.dtype(np.int32) in dtypes:
+                passing = [candidate for candidate in passing if candidate[1].dtype != np.int32]
+            
+            passing.sort(key=lambda candidate: candidate[0])
+            if len(passing) > 1 and passing[0][0] * self.RAW_SCORE_MARGIN > passing[1][0]:
+                print(f"🔇 Raw interpretations {passing[0][1].dtype.name} and {passing[1][1].dtype.name} "
+                      f"are too close to call, skipping Whisper")
+                return None
+            
+            _, view, scale = passing[0]
+            audio_np = view.astype(np.float32)
+            if scale != 1.0:
+                audio_np /= scale
+            print(f"✅ Raw interpretation successful: {view.dtype.name}, shape={audio_np.shape}")
+            return audio_np
             
         except Exception as e:
             print(f"⚠️ Raw audio processing failed: {e}")
-            return ""
+            return None
+    
+    def _score_raw_candidate(self, view, scale):
+        """(spectral flatness, zero-crossing rate, rms) over sampled frames, or None if implausible
+
+        Only RAW_SCORE_FRAMES frames spread over the clip are copied and converted.
+        Speech has a peaky spectrum (low flatness) and a moderate zero-crossing rate;
+        white noise and misread bytes are flat and cross zero about every other sample.
+        """
+        frame = self.RAW_SCORE_FRAME
+        if len(view) < frame * 4:
+            return None
+        starts = np.linspace(0, len(view) - frame, min(self.RAW_SCORE_FRAMES, len(view) // frame)).astype(np.int64)
+        frames = view[starts[:, None] + np.arange(frame)].astype(np.float32) / scale
+        
+        if not np.isfinite(frames).all() or np.abs(frames).max() > 1.5:
+            return None
+        rms = float(np.sqrt(np.mean(np.square(frames))))
+        if rms < 0.001:
+            return None
+        
+        signs = np.signbit(frames)
+        zcr = float(np.mean(signs[:, 1:] != signs[:, :-1]))
+        
+        power = np.square(np.abs(np.fft.rfft(frames * np.hanning(frame).astype(np.float32), axis=1))) + 1e-10
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        # Judge by the frames with the most energy so pauses between words don't dominate
+        loud = np.argsort(np.mean(np.square(frames), axis=1))[len(frames) // 2:]
+        return float(np.median(flatness[loud])), zcr, rms
+    
+    def _transcribe_numpy_array(self, audio_np, language=None):
+        """Transcribe numpy audio array using Whisper"""
+        clip = self.prepare_clip(audio_np)
+        if clip is None:
+            return _empty_result()
+        return self.transcribe_clips([clip], [language])[0]
+    
+    def prepare_clip(self, audio_np):
+        """Trim silence and plan ≤30s windows; None when there is nothing to transcribe"""
+        if audio_np is None:
+            return None
+        print(f"📐 Processing audio array: shape={audio_np.shape}")
+        
+        # Check audio length
+        if len(audio_np) < 1000:  # Less than ~0.06 seconds at 16kHz
+            print("⚠️ Audio too short")
+            return None
+        
+        duration = len(audio_np) / self.SAMPLE_RATE
+        print(f"📏 Audio duration: {duration:.2f} seconds")
+        
+        # Drop leading/trailing silence and long pauses before the model sees the clip
+        audio_np = self._trim_silence(audio_np)
+        if audio_np is None:
+            print("🔇 No speech detected, skipping Whisper")
+            return None
+        
+        # Split long answers at pauses so nothing past 30s is dropped
+        windows = self._split_windows(audio_np)
+        print(f"✂️ Split into {len(windows)} window(s)")
+        return {'audio': audio_np, 'windows': windows}
     
-    def _transcribe_numpy_array(self, audio_np):
-        """Transcribe numpy audio array using Whisper (same as working example)"""
+    def transcribe_clips(self, clips, languages):
+        """Transcribe prepared clips together with the model backend; one result dict per clip
+
+        A pinned or forced language skips the backend's language detection.
+        """
         try:
-            print(f"📐 Processing audio array: shape={audio_np.shape}")
-            
-            # Check audio length
-            if len(audio_np) < 1000:  # Less than ~0.06 seconds at 16kHz
-                print("⚠️ Audio too short")
-                return ""
-            
-            duration = len(audio_np) / 16000  # Assuming 16kHz
-            print(f"📏 Audio duration: {duration:.2f} seconds")
-            
-            # Use the same processing as the working example
-            audio_padded = whisper.pad_or_trim(audio_np)
-            print("✅ Audio padded/trimmed")
-            
-            # Create mel spectrogram
-            mel = whisper.log_mel_spectrogram(audio_padded).to(self.model.device)
-            print("✅ Mel spectrogram created")
-            
-            # Detect language (same as working example)
-            _, probs = self.model.detect_language(mel)
-            language = max(probs, key=probs.get)
-            print(f"🌍 Detected language: {language}")
-            
-            # Decode audio (same as working example)
-            print("🤖 Starting Whisper decode...")
-            result = whisper.decode(
-                self.model, 
-                mel, 
-                whisper.DecodingOptions(
-                    language=language, 
-                    fp16=False
-                )
-            )
-            
-            transcription = result.text.strip()
-            print(f"✅ Transcription successful: '{transcription}'")
-            
-            # Clean up transcription
-            if transcription:
-                transcription = self._clean_transcription(transcription)
-                print(f"🧹 Cleaned transcription: '{transcription}'")
+            resolved = []
+            for language in languages:
+                language = Config.WHISPER_LANGUAGE or language
+                if language and not self.backend.is_known_language(language):
+                    print(f"⚠️ Unknown language '{language}', detecting instead")
+                    language = None
+                resolved.append(language)
             
-            return transcription
+            results = []
+            for transcription, language, probability in self.backend.transcribe_clips(clips, resolved):
+                print(f"✅ Transcription successful: '{transcription}'")
+                
+                # Clean up transcription
+                if transcription:
+                    transcription = self._clean_transcription(transcription)
+                    print(f"🧹 Cleaned transcription: '{transcription}'")
+                
+                results.append({'text': transcription, 'language': language,
+                                'language_probability': probability})
+            return results
             
         except Exception as e:
             print(f"❌ Numpy array transcription failed: {e}")
             raise
     
+    def _split_windows(self, audio_np):
+        """Split audio into windows of at most 30s, cutting at the quietest point near each limit
+
+        Returns [(start, end, overlaps_previous)]. When no pause is quiet enough the cut is made
+        at the limit and the next window starts OVERLAP_SECONDS earlier so no word is lost.
+        """
+        total = len(audio_np)
+        window = int(self.WINDOW_SECONDS * self.SAMPLE_RATE)
+        if total <= window:
+            return [(0, total, False)]
+        
+        search = int(self.SPLIT_SEARCH_SECONDS * self.SAMPLE_RATE)
+        overlap = int(self.OVERLAP_SECONDS * self.SAMPLE_RATE)
+        frame = self.SPLIT_FRAME
+        silence_rms = Config.SILENCE_THRESHOLD / 32768.0
+        
+        windows = []
+        start, overlapped = 0, False
+        while total - start > window:
+            limit = start + window
+            rms = _frame_rms(audio_np[limit - search:limit], frame)
+            quietest = int(np.argmin(rms))
+            if rms[quietest] <= silence_rms:
+                # Cut in the middle of the pause
+                cut = limit - search + quietest * frame + frame // 2
+                windows.append((start, cut, overlapped))
+                start, overlapped = cut, False
+            else:
+                windows.append((start, limit, overlapped))
+                start, overlapped = limit - overlap, True
+        windows.append((start, total, overlapped))
+        return windows
+    
+    def _trim_silence(self, audio_np):
+        """Energy-based VAD: returns the clip without surrounding silence, or None if no speech
+
+        Frames are AUDIO_CHUNK_SIZE bytes of 16-bit audio; a frame is speech when its RMS exceeds
+        SILENCE_THRESHOLD (int16 units). Leading and trailing silence is cut to VAD_PAD_SECONDS,
+        and pauses longer than SILENCE_DURATION keep only VAD_PAD_SECONDS on each side
+        (2 x VAD_PAD_SECONDS in total).
+        """
+        frame = max(1, Config.AUDIO_CHUNK_SIZE // 2)
+        rms = _frame_rms(audio_np, frame)
+        if len(rms) == 0:
+            return audio_np
+        
+        speech = rms > Config.SILENCE_THRESHOLD / 32768.0
+        seconds_in = len(audio_np) / self.SAMPLE_RATE
+        if not speech.any():
+            self._record_vad(seconds_in, seconds_in, no_speech=True)
+            return None
+        
+        pad = int(self.VAD_PAD_SECONDS * self.SAMPLE_RATE / frame)
+        max_gap = int(Config.SILENCE_DURATION * self.SAMPLE_RATE / frame)
+        
+        # Silent runs as [start, end) frame ranges
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], (~speech).astype(np.int8), [0]))))
+        keep = np.ones(len(speech), dtype=bool)
+        for start, end in zip(edges[::2], edges[1::2]):
+            if start == 0:
+                keep[:max(end - pad, 0)] = False
+            elif end == len(speech):
+                keep[start + pad:] = False
+            elif end - start > max_gap:
+                keep[start + pad:end - pad] = False
+        
+        if keep.all():
+            self._record_vad(seconds_in, 0.0)
+            return audio_np
+        
+        sample_mask = np.repeat(keep, frame)
+        tail = len(audio_np) - len(sample_mask)
+        if tail:
+            sample_mask = np.concatenate((sample_mask, np.full(tail, keep[-1])))
+        trimmed = audio_np[sample_mask]
+        
+        seconds_trimmed = seconds_in - len(trimmed) / self.SAMPLE_RATE
+        self._record_vad(seconds_in, seconds_trimmed)
+        print(f"✂️ VAD trimmed {seconds_trimmed:.2f}s of silence")
+        return trimmed
+    
+    def _record_vad(self, seconds_in, seconds_trimmed, no_speech=False):
+        with self._stats_lock:
+            self._stats['clips'] += 1
+            self._stats['seconds_in'] += seconds_in
+            self._stats['seconds_trimmed'] += seconds_trimmed
+            if no_speech:
+                self._stats['no_speech'] += 1
+    
+    def get_stats(self):
+        """Voice-activity trimming counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['seconds_in'] = round(stats['seconds_in'], 2)
+        stats['seconds_trimmed'] = round(stats['seconds_trimmed'], 2)
+        stats['trimmed_ratio'] = round(stats['seconds_trimmed'] / stats['seconds_in'], 3) if stats['seconds_in'] else 0.0
+        return stats
+    
+    def warmup(self, seconds=1.0):
+        """Run one decode on a synthetic clip so the first real request skips allocation/JIT costs"""
+        if not self.backend:
+            return 0.0
+        return self.backend.warmup(seconds)
+    
     def transcribe_audio(self, audio_file_path):
         """Transcribe from file path (fallback method)"""
         print(f"📁 Reading audio file: {audio_file_path}")
@@ -324,10 +579,109 @@ class SpeechToText(WebMCompatibleSpeechToText):
     pass
 
 # Factory function
-def create_speech_to_text(model_name="base", enhanced=True):
-    """Create SpeechToText instance with WebM compatibility"""
-    print(f"🏭 Creating WebM-compatible speech-to-text instance: model={model_name}")
-    return WebMCompatibleSpeechToText(model_name)
+def create_speech_to_text(model_name="base", enhanced=True, backend=None):
+    """Create SpeechToText instance with WebM compatibility on the configured model backend"""
+    print(f"🏭 Creating WebM-compatible speech-to-text instance: model={model_name}, "
+          f"backend={backend or Config.STT_BACKEND}")
+    return WebMCompatibleSpeechToText(model_name, backend=backend)
+
+class SpeechToTextProvider:
+    """Loads the speech-to-text model in a background thread and shares it
+
+    The web app starts serving while the model loads; request handlers call get()
+    and report "still loading" instead of blocking the whole process at import time.
+    With replicas > 1 that many independent model copies are loaded for the
+    transcription service's workers; get() returns the first.
+    """
+
+    def __init__(self, model_name=None, warmup=None, replicas=None):
+        self.model_name = model_name or Config.WHISPER_MODEL
+        self.warmup_enabled = Config.WHISPER_WARMUP if warmup is None else warmup
+        self.replicas = max(1, replicas or Config.WHISPER_REPLICAS)
+        self._instances = []
+        self._state = 'idle'  # idle -> loading -> ready | failed | disabled
+        self._error = None
+        self._load_seconds = None
+        self._warmup_seconds = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin loading in the background (idempotent)"""
+        with self._lock:
+            if self._state != 'idle':
+                return
+            if not WHISPER_AVAILABLE:
+                self._state = 'disabled'
+                self._error = f"Speech backend '{Config.STT_BACKEND}' is not installed"
+                self._ready.set()
+                return
+            self._state = 'loading'
+        thread_manager.start_thread(self._load)
+
+    def _load(self):
+        try:
+            start = time.perf_counter()
+            instances = []
+            for _ in range(self.replicas):
+                instance = create_speech_to_text(model_name=self.model_name, enhanced=True)
+                if not instance.model:
+                    raise RuntimeError(f"Whisper model '{self.model_name}' failed to load")
+                instances.append(instance)
+            self._load_seconds = round(time.perf_counter() - start, 2)
+            if self.warmup_enabled:
+                try:
+                    self._warmup_seconds = round(sum(instance.warmup() for instance in instances), 2)
+                except Exception as e:
+                    print(f"⚠️ Whisper warmup failed: {e}")
+            self._instances = instances
+            self._state = 'ready'
+            print(f"✅ Speech-to-text ready: {len(instances)} replica(s), load {self._load_seconds}s")
+        except Exception as e:
+            self._state = 'failed'
+            self._error = str(e)
+            print(f"⚠️ Speech-to-text loading failed: {e}")
+            print("🔧 Speech-to-text features will be disabled")
+        finally:
+            self._ready.set()
+
+    def get(self, timeout=0):
+        """Return the shared instance, waiting up to timeout seconds; None if not ready"""
+        self.start()
+        self._ready.wait(timeout)
+        return self._instances[0] if self._instances else None
+
+    def replica(self, index, timeout=None):
+        """Return model replica `index`, waiting for loading to finish; None if loading failed"""
+        self.start()
+        self._ready.wait(timeout)
+        return self._instances[index] if index < len(self._instances) else None
+
+    def is_ready(self):
+        return self._state == 'ready'
+
+    def status(self):
+        """Readiness information for health checks"""
+        vad = None
+        for instance in self._instances:
+            stats = instance.get_stats()
+            if vad is None:
+                vad = stats
+            else:
+                for key in ('clips', 'no_speech', 'seconds_in', 'seconds_trimmed'):
+                    vad[key] = round(vad[key] + stats[key], 2)
+        if vad:
+            vad['trimmed_ratio'] = round(vad['seconds_trimmed'] / vad['seconds_in'], 3) if vad['seconds_in'] else 0.0
+        return {
+            'state': self._state,
+            'model': self.model_name,
+            'backend': Config.STT_BACKEND,
+            'replicas': self.replicas,
+            'load_seconds': self._load_seconds,
+            'warmup_seconds': self._warmup_seconds,
+            'error': self._error,
+            'vad': vad,
+        }
 
 # Installation check
 def check_dependencies():
@@ -0,0 +1,224 @@
+# Speech-to-text model backends used by WebMCompatibleSpeechToText
+import importlib.util
+import time
+
+import numpy as np
+
+from config import Config
+
+# Heavy imports (torch, whisper, ctranslate2) happen when a backend loads its model
+whisper = None
+torch = None
+
+def _import_whisper():
+    """Import whisper (and torch) on first use"""
+    global whisper, torch
+    if whisper is None:
+        import torch as torch_module
+        import whisper as whisper_module
+        torch = torch_module
+        whisper = whisper_module
+    return whisper
+
+def stitch_windows(texts, overlaps, max_overlap_words=12):
+    """Join window transcripts, dropping words repeated across overlapping boundaries"""
+    words = []
+    for text, overlapped in zip(texts, overlaps):
+        new_words = text.split()
+        if overlapped and words and new_words:
+            def norm(w):
+                return w.lower().strip(".,!?;:")
+            limit = min(max_overlap_words, len(words), len(new_words))
+            for n in range(limit, 0, -1):
+                if [norm(w) for w in words[-n:]] == [norm(w) for w in new_words[:n]]:
+                    new_words = new_words[n:]
+                    break
+        words.extend(new_words)
+    return " ".join(words)
+
+def _synthetic_clip(seconds=1.0):
+    """Amplitude-modulated tone used for warmup decodes"""
+    t = np.arange(int(16000 * seconds), dtype=np.float32) / 16000
+    return (0.1 * np.sin(2 * np.pi * 220 * t) * np.sin(2 * np.pi * 3 * t)).astype(np.float32)
+
+
+class WhisperBackend:
+    """OpenAI Whisper in fp32 PyTorch on CPU
+
+    transcribe_clips() takes clips prepared by WebMCompatibleSpeechToText.prepare_clip
+    ({'audio', 'windows'}) and a language (or None) per clip, and returns
+    (text, language, language_probability) per clip.
+    """
+
+    name = "whisper"
+
+    @staticmethod
+    def available():
+        return importlib.util.find_spec("whisper") is not None
+
+    def __init__(self, model_name="base"):
+        self.model_name = model_name
+        self.model = None
+        print(f"🔄 Loading Whisper model: {model_name} ({self.name})")
+        _import_whisper()
+        self.model = self._load_model()
+        print(f"✅ Whisper model '{model_name}' loaded successfully ({self.name})")
+
+    def _load_model(self):
+        return whisper.load_model(self.model_name, device="cpu")
+
+    def is_known_language(self, language):
+        return language in whisper.tokenizer.LANGUAGES
+
+    def transcribe_clips(self, clips, languages):
+        """All windows of all clips are decoded in one whisper.decode call per language
+
+        Clips without a language share one detect_language pass first.
+        """
+        # One mel spectrogram per window
+        mels = [
+            torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(clip['audio'][start:end]))
+                for start, end, _ in clip['windows']
+            ])
+            for clip in clips
+        ]
+        print("✅ Mel spectrogram created")
+
+        resolved = list(languages)
+        probabilities = [None] * len(clips)
+        undetected = [i for i, language in enumerate(resolved) if not language]
+        if undetected:
+            detected = self._detect_languages([mels[i] for i in undetected])
+            for i, (language, probability) in zip(undetected, detected):
+                resolved[i], probabilities[i] = language, probability
+                print(f"🌍 Detected language: {language} ({probability:.2f})")
+
+        # Decode every window of every clip with the same language in one forward pass
+        results = [None] * len(clips)
+        groups = {}
+        for i, language in enumerate(resolved):
+            groups.setdefault(language, []).append(i)
+
+        for language, indexes in groups.items():
+            print(f"🤖 Starting Whisper decode: {len(indexes)} clip(s), language={language}")
+            batch = torch.cat([mels[i] for i in indexes]).to(self.model.device)
+            decoded = whisper.decode(
+                self.model,
+                batch,
+                whisper.DecodingOptions(
+                    language=language,
+                    fp16=False
+                )
+            )
+
+            offset = 0
+            for i in indexes:
+                count = mels[i].shape[0]
+                text = stitch_windows(
+                    [result.text.strip() for result in decoded[offset:offset + count]],
+                    [overlapped for _, _, overlapped in clips[i]['windows']]
+                )
+                offset += count
+                results[i] = (text, language, probabilities[i])
+
+        return results
+
+    def _detect_languages(self, mels):
+        """Most likely language of each clip (over all its windows) from one detection pass"""
+        _, probs = self.model.detect_language(torch.cat(mels).to(self.model.device))
+        if isinstance(probs, dict):
+            probs = [probs]
+
+        detected = []
+        offset = 0
+        for mel in mels:
+            count = mel.shape[0]
+            totals = {}
+            for window_probs in probs[offset:offset + count]:
+                for language, p in window_probs.items():
+                    totals[language] = totals.get(language, 0.0) + p
+            offset += count
+            language = max(totals, key=totals.get)
+            detected.append((language, totals[language] / count))
+        return detected
+
+    def warmup(self, seconds=1.0):
+        """Run one decode on a synthetic clip so the first real request skips allocation/JIT costs"""
+        start = time.perf_counter()
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(_synthetic_clip(seconds))).to(self.model.device)
+        self.model.detect_language(mel)
+        whisper.decode(self.model, mel, whisper.DecodingOptions(language="en", fp16=False))
+        elapsed = time.perf_counter() - start
+        print(f"🔥 Whisper warmup decode took {elapsed:.2f}s")
+        return elapsed
+
+
+class QuantizedWhisperBackend(WhisperBackend):
+    """Whisper with its Linear layers dynamically quantized to int8 (CPU only)"""
+
+    name = "whisper-int8"
+
+    def _load_model(self):
+        model = whisper.load_model(self.model_name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class FasterWhisperBackend:
+    """faster-whisper (CTranslate2) with int8 weights by default
+
+    CTranslate2 handles long audio itself, so each clip is transcribed whole rather
+    than per window; clips are processed one after another.
+    """
+
+    name = "faster-whisper"
+
+    @staticmethod
+    def available():
+        return importlib.util.find_spec("faster_whisper") is not None
+
+    def __init__(self, model_name="base"):
+        from faster_whisper import WhisperModel
+
+        self.model_name = model_name
+        print(f"🔄 Loading faster-whisper model: {model_name} ({Config.FASTER_WHISPER_COMPUTE_TYPE})")
+        self.model = WhisperModel(model_name, device="cpu", compute_type=Config.FASTER_WHISPER_COMPUTE_TYPE)
+        print(f"✅ faster-whisper model '{model_name}' loaded successfully")
+
+    def is_known_language(self, language):
+        supported = getattr(self.model, 'supported_languages', None)
+        return language in supported if supported else bool(language)
+
+    def transcribe_clips(self, clips, languages):
+        results = []
+        for clip, language in zip(clips, languages):
+            segments, info = self.model.transcribe(clip['audio'], language=language or None,
+                                                   beam_size=1, vad_filter=False)
+            text = " ".join(segment.text.strip() for segment in segments)
+            probability = None if language else info.language_probability
+            if not language:
+                print(f"🌍 Detected language: {info.language} ({info.language_probability:.2f})")
+            results.append((text, info.language, probability))
+        return results
+
+    def warmup(self, seconds=1.0):
+        start = time.perf_counter()
+        segments, _ = self.model.transcribe(_synthetic_clip(seconds), language="en", beam_size=1)
+        list(segments)
+        elapsed = time.perf_counter() - start
+        print(f"🔥 faster-whisper warmup decode took {elapsed:.2f}s")
+        return elapsed
+
+
+STT_BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    QuantizedWhisperBackend.name: QuantizedWhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+def get_backend_class(name=None):
+    """Backend class for a Config.STT_BACKEND name"""
+    name = (name or Config.STT_BACKEND).lower()
+    if name not in STT_BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}'. Options: {', '.join(STT_BACKENDS)}")
+    return STT_BACKENDS[name]
@@ -0,0 +1,188 @@
+# Whisper inference service: model replicas behind a bounded request queue
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from config import Config
+from utils.batching import collect_batch
+from utils.safe_threading import thread_manager
+
+
+class ServiceBusyError(Exception):
+    """Raised when the transcription queue is full; callers should retry later"""
+
+
+class TranscriptionService:
+    """Serializes Whisper inference onto one worker thread per model replica
+
+    Request handlers never touch a model directly: they decode their clip, submit it
+    and wait on a future. Each worker owns one replica and pins its torch intra-op
+    thread count so replicas split the CPU cores instead of oversubscribing them.
+    With one replica this is a single model behind a serialized queue.
+
+    Workers micro-batch: after taking a clip they keep collecting clips for up to
+    batch_window_ms or until batch_size is reached, then transcribe them together
+    (one decode per language) and resolve each request's future.
+    """
+
+    def __init__(self, provider, max_pending=None, threads_per_replica=None, batch_size=None,
+                 batch_window_ms=None):
+        self.provider = provider
+        self.batch_size = max(1, batch_size or Config.WHISPER_BATCH_SIZE)
+        self.batch_window = (batch_window_ms if batch_window_ms is not None else Config.WHISPER_BATCH_WINDOW_MS) / 1000.0
+        self.replicas = provider.replicas
+        self.threads_per_replica = (threads_per_replica or Config.WHISPER_THREADS_PER_REPLICA
+                                    or max(1, (os.cpu_count() or 1) // self.replicas))
+        self._queue = queue.Queue(maxsize=max_pending or Config.WHISPER_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._workers = []
+        self._busy = 0
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0, 'batches': 0,
+                       'queue_wait_total': 0.0, 'queue_wait_max': 0.0,
+                       'inference_total': 0.0, 'inference_max': 0.0}
+
+    def start(self):
+        """Start one worker per replica (idempotent)"""
+        with self._start_lock:
+            if self._workers:
+                return
+            for index in range(self.replicas):
+                self._workers.append(thread_manager.start_thread(self._worker_loop, args=(index,)))
+            print(f"✅ Transcription service started: {self.replicas} replica(s) x "
+                  f"{self.threads_per_replica} thread(s)")
+
+    def submit(self, audio_bytes, language=None):
+        """Decode a clip on the calling thread and queue it; returns a Future of
+        transcribe_audio_info's result
+
+        Raises ServiceBusyError when the queue is full.
+        """
+        instance = self.provider.get()
+        if instance is None:
+            raise RuntimeError("Speech recognition not available")
+        clip = instance.prepare_clip(instance.decode_audio_bytes(audio_bytes))
+        return self.submit_clip(clip, language)
+
+    def submit_clip(self, clip, language=None):
+        """Queue a prepared clip (see prepare_clip); None resolves to an empty result at once"""
+        future = Future()
+        if clip is None:
+            future.set_result({'text': '', 'language': None, 'language_probability': None})
+            return future
+
+        self.start()
+        try:
+            self._queue.put_nowait((clip, language, future, time.perf_counter()))
+        except queue.Full:
+            with self._lock:
+                self._stats['rejected'] += 1
+            raise ServiceBusyError("Transcription queue is full")
+        with self._lock:
+            self._stats['submitted'] += 1
+        return future
+
+    def has_capacity(self):
+        """True when a worker is idle and nothing is queued; best-effort work checks this first"""
+        with self._lock:
+            idle = self._busy < self.replicas
+        return idle and self._queue.empty()
+
+    def transcribe(self, audio_bytes, language=None, timeout=None):
+        """Submit a clip and block for its result"""
+        timeout = timeout if timeout is not None else Config.WHISPER_REQUEST_TIMEOUT
+        return self.submit(audio_bytes, language).result(timeout)
+
+    def _worker_loop(self, index):
+        """Own replica `index` and run batches of queued clips on it until shutdown"""
+        instance = self.provider.replica(index)
+        if instance is None:
+            print(f"⚠️ Transcription worker {index} has no model, failing its requests")
+        else:
+            self._pin_threads()
+
+        while not thread_manager.is_shutdown_requested():
+            batch = collect_batch(self._queue, self.batch_size, self.batch_window)
+            if not batch:
+                continue
+
+            taken = len(batch)
+            try:
+                batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+                if batch:
+                    self._run(instance, batch)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+
+    def _pin_threads(self):
+        """Give this replica its share of intra-op threads"""
+        try:
+            import torch
+            torch.set_num_threads(self.threads_per_replica)
+        except Exception as e:
+            print(f"⚠️ Could not set torch threads: {e}")
+
+    def _run(self, instance, batch):
+        """Transcribe a batch together, falling back to one clip at a time if that fails"""
+        started_at = time.perf_counter()
+        with self._lock:
+            self._busy += 1
+            self._stats['batches'] += 1
+        outcomes = []
+        try:
+            if instance is None:
+                raise RuntimeError("Speech recognition not available")
+            results = instance.transcribe_clips([job[0] for job in batch], [job[1] for job in batch])
+            outcomes = [(result, None) for result in results]
+            if len(batch) > 1:
+                print(f"📦 Transcribed {len(batch)} clips in one batch")
+        except Exception as e:
+            if instance is None or len(batch) == 1:
+                outcomes = [(None, e)]
+            else:
+                print(f"⚠️ Batch transcription failed, transcribing individually: {e}")
+                for clip, language, _, _ in batch:
+                    try:
+                        outcomes.append((instance.transcribe_clips([clip], [language])[0], None))
+                    except Exception as clip_error:
+                        outcomes.append((None, clip_error))
+            if len(outcomes) < len(batch):
+                outcomes = outcomes * len(batch)
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+        inference = time.perf_counter() - started_at
+        for (clip, language, future, queued_at), (result, error) in zip(batch, outcomes):
+            queue_wait = started_at - queued_at
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+            with self._lock:
+                self._stats['failed' if error else 'completed'] += 1
+                self._stats['queue_wait_total'] += queue_wait
+                self._stats['queue_wait_max'] = max(self._stats['queue_wait_max'], queue_wait)
+                self._stats['inference_total'] += inference
+                self._stats['inference_max'] = max(self._stats['inference_max'], inference)
+        print(f"⏱️ Transcription batch of {len(batch)}: inference={inference:.3f}s")
+
+    def get_stats(self):
+        """Queue depth plus queue-wait and inference time averages"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['busy_workers'] = self._busy
+        finished = stats['completed'] + stats['failed']
+        for name in ('queue_wait', 'inference'):
+            total = stats.pop(f'{name}_total')
+            stats[f'avg_{name}_seconds'] = round(total / finished, 3) if finished else 0.0
+            stats[f'max_{name}_seconds'] = round(stats.pop(f'{name}_max'), 3)
+        stats['avg_batch_size'] = round(finished / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['queued'] = self._queue.qsize()
+        stats['batch_size'] = self.batch_size
+        stats['replicas'] = self.replicas
+        stats['threads_per_replica'] = self.threads_per_replica
+        return stats
@@ -0,0 +1,196 @@
+# Incremental transcription of an answer while it is still being recorded
+import subprocess
+import threading
+
+import numpy as np
+
+from config import Config
+from utils.speech_to_text_whisper import FFMPEG_PATH, WebMCompatibleSpeechToText, _frame_rms
+from utils.stt_backends import stitch_windows
+from utils.stt_service import ServiceBusyError
+
+SAMPLE_RATE = WebMCompatibleSpeechToText.SAMPLE_RATE
+BYTES_PER_SAMPLE = 4  # f32le
+
+
+def streaming_available():
+    """Streaming needs ffmpeg to decode MediaRecorder chunks as they arrive"""
+    return FFMPEG_PATH is not None
+
+
+class StreamingTranscription:
+    """One answer streamed as MediaRecorder timeslice chunks
+
+    A single ffmpeg process lives for the whole answer: chunks are written to its stdin
+    and a reader thread appends the decoded 16kHz PCM to a rolling buffer. poll() submits
+    the uncommitted part of the buffer for a partial transcript whenever enough new audio
+    has arrived and the transcription service is idle, so partials never queue ahead of
+    uploaded answers. Once the uncommitted audio reaches commit_seconds it is cut at a
+    pause, the head is transcribed for good and dropped from the buffer, so finish() only
+    has to decode the last stretch (at most one window) after the candidate stops.
+    """
+
+    def __init__(self, service, language=None, partial_seconds=None, commit_seconds=None):
+        self.service = service
+        self.language = language
+        self.partial_samples = int((partial_seconds or Config.STT_STREAM_PARTIAL_SECONDS) * SAMPLE_RATE)
+        self.commit_samples = int((commit_seconds or Config.STT_STREAM_COMMIT_SECONDS) * SAMPLE_RATE)
+        self._pcm = bytearray()       # decoded audio from _committed_at on
+        self._pcm_lock = threading.Lock()
+        self._committed_at = 0        # samples already sent for a final transcript
+        self._commits = []            # [(future, overlaps_previous)] in audio order
+        self._overlap_next = False    # whether the audio after the last commit repeats its end
+        self._partial = None          # (future, committed count when submitted)
+        self._partial_at = 0          # buffer length (samples) at the last partial
+        self._last_text = ''
+        self._process = None
+        self._reader = None
+
+    def start(self):
+        command = [
+            FFMPEG_PATH, "-nostdin", "-hide_banner", "-loglevel", "error",
+            "-probesize", "32768", "-analyzeduration", "0", "-fflags", "nobuffer",
+            "-i", "pipe:0",
+            "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "pipe:1"
+        ]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL)
+        # Per-stream thread, so it is not registered with the long-lived thread manager
+        self._reader = threading.Thread(target=self._read_pcm, daemon=True)
+        self._reader.start()
+        print("🎙️ Streaming transcription started")
+
+    def _read_pcm(self):
+        stdout = self._process.stdout
+        while True:
+            data = stdout.read1(65536) if hasattr(stdout, 'read1') else stdout.read(65536)
+            if not data:
+                break
+            with self._pcm_lock:
+                self._pcm.extend(data)
+
+    def feed(self, chunk):
+        """Pass one MediaRecorder chunk to the decoder"""
+        try:
+            self._process.stdin.write(chunk)
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Audio decoder stopped: {e}")
+
+    def _samples(self):
+        """Samples decoded so far, without copying anything"""
+        with self._pcm_lock:
+            return self._committed_at + len(self._pcm) // BYTES_PER_SAMPLE
+
+    def _tail(self):
+        """Uncommitted audio (whole samples only); the only part of the answer that is copied"""
+        with self._pcm_lock:
+            usable = len(self._pcm) // BYTES_PER_SAMPLE * BYTES_PER_SAMPLE
+            with memoryview(self._pcm) as view:
+                data = bytes(view[:usable])
+        return np.frombuffer(data, dtype=np.float32)
+
+    def _submit(self, audio_np):
+        """Queue audio with the transcription service; None when there is no speech"""
+        instance = self.service.provider.get()
+        if instance is None:
+            raise RuntimeError("Speech recognition not available")
+        return self.service.submit_clip(instance.prepare_clip(audio_np), self.language)
+
+    def _commit(self, tail):
+        """Finalize uncommitted audio up to the quietest point near commit_samples
+
+        Returns how many samples of `tail` were consumed (and dropped from the buffer).
+        """
+        end = self.commit_samples
+        search = min(int(WebMCompatibleSpeechToText.SPLIT_SEARCH_SECONDS * SAMPLE_RATE), self.commit_samples)
+        frame = WebMCompatibleSpeechToText.SPLIT_FRAME
+        rms = _frame_rms(tail[end - search:end], frame)
+        quietest = int(np.argmin(rms))
+        if rms[quietest] <= Config.SILENCE_THRESHOLD / 32768.0:
+            cut = next_start = end - search + quietest * frame + frame // 2
+        else:
+            # Mid-speech: the next stretch repeats OVERLAP_SECONDS so no word is cut in half
+            cut = end
+            next_start = end - int(WebMCompatibleSpeechToText.OVERLAP_SECONDS * SAMPLE_RATE)
+        self._commits.append((self._submit(tail[:cut]), self._overlap_next))
+        committed_until = self._committed_at + cut
+        with self._pcm_lock:
+            del self._pcm[:next_start * BYTES_PER_SAMPLE]
+            self._committed_at += next_start
+        self._overlap_next = next_start < cut
+        print(f"📌 Committed {committed_until / SAMPLE_RATE:.1f}s of streamed audio")
+        return next_start
+
+    def _text(self, tail_text=None):
+        """Committed transcripts that are ready, followed by the tail's text"""
+        texts, overlaps = [], []
+        for future, overlapped in self._commits:
+            if not future.done():
+                break
+            texts.append('' if future.exception() else future.result()['text'])
+            overlaps.append(overlapped)
+        else:
+            if tail_text is not None:
+                texts.append(tail_text)
+                overlaps.append(self._overlap_next)
+        return stitch_windows(texts, overlaps)
+
+    def poll(self):
+        """Submit a partial when enough new audio arrived; returns new partial text or None"""
+        update = None
+        if self._partial and self._partial[0].done():
+            future, commits = self._partial
+            self._partial = None
+            if not future.exception() and commits == len(self._commits):
+                text = self._text(future.result()['text'])
+                if text != self._last_text:
+                    self._last_text = update = text
+
+        total = self._samples()
+        try:
+            if total - self._committed_at >= self.commit_samples:
+                self._commit(self._tail())
+            if (self._partial is None and total - self._partial_at >= self.partial_samples
+                    and self.service.has_capacity()):
+                self._partial_at = total
+                self._partial = (self._submit(self._tail()), len(self._commits))
+        except ServiceBusyError:
+            # Partials are best effort; finish() will still transcribe everything
+            print("⚠️ Transcription queue full, skipping partial")
+        return update
+
+    def finish(self, timeout=None):
+        """Flush the decoder, transcribe the remaining audio and return the final result dict"""
+        timeout = timeout if timeout is not None else Config.WHISPER_REQUEST_TIMEOUT
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._reader.join(timeout=Config.AUDIO_DECODE_TIMEOUT)
+        if self._partial:
+            self._partial[0].cancel()
+            self._partial = None
+
+        total = self._samples()
+        audio_np = self._tail()
+        while len(audio_np) > self.commit_samples:
+            audio_np = audio_np[self._commit(audio_np):]
+        tail = self._submit(audio_np).result(timeout)
+        for future, _ in self._commits:
+            future.result(timeout)
+
+        text = self._text(tail['text'])
+        results = [future.result() for future, _ in self._commits] + [tail]
+        detected = next((result for result in results if result['language']), tail)
+        print(f"✅ Streaming transcription finished: {total / SAMPLE_RATE:.1f}s of audio")
+        return {'text': text, 'language': detected['language'],
+                'language_probability': detected['language_probability'],
+                'seconds': round(total / SAMPLE_RATE, 2)}
+
+    def close(self):
+        """Stop the decoder (safe to call more than once)"""
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
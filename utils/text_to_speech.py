@@ -3,11 +3,72 @@ import os
 import tempfile
 import subprocess
 import platform
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from utils.async_loop import background_loop
+from utils.tts_cache import tts_cache
+from utils.tts_pool import tts_pool, TTSBusyError
+from utils.tts_scheduler import EngineScheduler
+
+def audio_mime_type(audio_data):
+    """MIME type of synthesized audio (the engines produce WAV or MP3)"""
+    if audio_data[:4] == b'RIFF':
+        return 'audio/wav'
+    return 'audio/mpeg'
+
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s+')
+# Words that end in a period without ending the sentence ("e.g. Python", "Dr. Smith")
+ABBREVIATIONS = {'e.g', 'i.e', 'vs', 'cf', 'approx', 'dr', 'mr', 'mrs', 'ms', 'prof', 'sr', 'jr', 'st', 'al', 'fig'}
+
+def _is_sentence_end(text, match):
+    """False for periods after abbreviations or initials, or when the next word is lowercase"""
+    following = text[match.end():match.end() + 1]
+    if following.islower():
+        return False
+    if text[match.start()] != '.':
+        return True
+    word = re.search(r'[\w.]*$', text[:match.start()]).group().lower()
+    return not (word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()))
+
+def split_sentences(text, min_chars=None):
+    """Split text at sentence ends, merging fragments shorter than min_chars into their neighbour
+
+    Abbreviations, initials and decimals do not end a sentence. This is the only splitter:
+    pre-synthesis, /speak_text/sentences and the interview page all use it, so the cached
+    segments are the ones that get requested.
+    """
+    min_chars = min_chars if min_chars is not None else Config.TTS_MIN_SENTENCE_CHARS
+    text = text.strip()
+    parts, start = [], 0
+    for match in SENTENCE_END.finditer(text):
+        if _is_sentence_end(text, match):
+            parts.append(text[start:match.end()])
+            start = match.end()
+    parts.append(text[start:])
+    
+    sentences = []
+    for part in parts:
+        part = part.strip()
+        if not part:
+            continue
+        if sentences and len(sentences[-1]) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {part}"
+        else:
+            sentences.append(part)
+    if len(sentences) > 1 and len(sentences[-1]) < min_chars:
+        last = sentences.pop()
+        sentences[-1] = f"{sentences[-1]} {last}"
+    return sentences
 
 class TextToSpeech:
     def __init__(self):
         self.available_engines = self._detect_engines()
+        self.scheduler = EngineScheduler(self.available_engines)
+        self._sentence_executor = None
+        self._executor_lock = threading.Lock()
         print(f"🔊 Available TTS engines: {self.available_engines}")
     
     def _detect_engines(self):
@@ -48,54 +109,26 @@ class TextToSpeech:
     async def speak_text_edge(self, text, voice="en-US-JennyNeural"):
         """Use Microsoft Edge TTS (best quality)"""
         try:
-            import edge_tts
-            import asyncio
-            
-            communicate = edge_tts.Communicate(text, voice)
-            audio_data = b""
-            
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio":
-                    audio_data += chunk["data"]
-            
-            return audio_data
+            chunks = [chunk async for chunk in self.stream_text_edge(text, voice)]
+            return b"".join(chunks)
         except Exception as e:
             raise Exception(f"Edge TTS failed: {e}")
     
+    async def stream_text_edge(self, text, voice="en-US-JennyNeural"):
+        """Yield Edge TTS audio (MP3) chunks as they arrive"""
+        import edge_tts
+        
+        communicate = edge_tts.Communicate(text, voice)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+    
     def speak_text_pyttsx3(self, text):
-        """Use pyttsx3 (cross-platform)"""
+        """Use pyttsx3 (cross-platform) on a warm engine from the offline pool"""
         try:
-            import pyttsx3
-            
-            engine = pyttsx3.init()
-            
-            # Set properties
-            engine.setProperty('rate', 150)    # Speed
-            engine.setProperty('volume', 0.8)  # Volume
-            
-            # Get voices and set to female if available
-            voices = engine.getProperty('voices')
-            for voice in voices:
-                if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                    engine.setProperty('voice', voice.id)
-                    break
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-                temp_path = temp_file.name
-            
-            engine.save_to_file(text, temp_path)
-            engine.runAndWait()
-            
-            # Read the audio file
-            with open(temp_path, 'rb') as f:
-                audio_data = f.read()
-            
-            # Clean up
-            os.remove(temp_path)
-            
-            return audio_data
-            
+            return tts_pool.synthesize('pyttsx3', text)
+        except TTSBusyError:
+            raise
         except Exception as e:
             raise Exception(f"pyttsx3 TTS failed: {e}")
     
@@ -122,6 +155,10 @@ class TextToSpeech:
         try:
             system = platform.system()
             
+            if system == "Linux":
+                # espeak writes the WAV to a pipe; runs on the offline pool's workers
+                return tts_pool.synthesize('espeak', text)
+            
             with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
                 temp_path = temp_file.name
             
@@ -138,10 +175,6 @@ class TextToSpeech:
             elif system == "Darwin":  # macOS
                 # Use macOS say command
                 subprocess.run(['say', '-o', temp_path, text], check=True)
-                
-            elif system == "Linux":
-                # Use espeak
-                subprocess.run(['espeak', '-w', temp_path, text], check=True)
             
             # Read the audio file
             with open(temp_path, 'rb') as f:
@@ -152,39 +185,188 @@ class TextToSpeech:
             
             return audio_data
             
+        except TTSBusyError:
+            raise
         except Exception as e:
             raise Exception(f"System TTS failed: {e}")
     
-    def generate_speech(self, text, voice="en-US-JennyNeural"):
-        """Generate speech using the best available method"""
+    def synthesize(self, engine, text, voice="en-US-JennyNeural"):
+        """Generate speech with one specific engine"""
+        if engine == 'edge-tts':
+            # Runs on the shared background loop instead of a new event loop per request
+            return background_loop.run(self.speak_text_edge(text, voice), timeout=Config.TTS_TIMEOUT)
+            
+        elif engine == 'pyttsx3':
+            return self.speak_text_pyttsx3(text)
+            
+        elif engine == 'gtts':
+            return self.speak_text_gtts(text)
+            
+        elif engine in ['windows-sapi', 'macos-say', 'linux-espeak']:
+            return self.speak_text_system(text)
+        
+        raise Exception(f"Unknown TTS engine: {engine}")
+    
+    def cached_speech(self, text, voice="en-US-JennyNeural"):
+        """Return (audio, engine) from the cache, preferring better engines, or (None, None)"""
+        keys = {tts_cache.make_key(engine, voice, text): engine for engine in self.available_engines}
+        key, audio_data = tts_cache.get_first(list(keys))
+        return (audio_data, keys[key]) if audio_data else (None, None)
+    
+    def generate_speech_info(self, text, voice="en-US-JennyNeural", exclude=(), order=None):
+        """Generate speech using the best available method; returns (audio, engine, cached)
+
+        Engines in `exclude` are skipped (e.g. one that already failed for this request).
+        `order` is an engine order the caller already took from the scheduler.
+        """
         if not text or not text.strip():
             raise Exception("No text provided")
         
-        # Try methods in order of preference
-        for engine in self.available_engines:
+        audio_data, engine = self.cached_speech(text, voice)
+        if audio_data:
+            return audio_data, engine, True
+        
+        # Try the fastest healthy engine first; failing engines are skipped while their breaker is open
+        for engine in order or self.scheduler.order():
+            if engine in exclude:
+                continue
+            started = time.perf_counter()
             try:
-                if engine == 'edge-tts':
-                    import asyncio
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    audio_data = loop.run_until_complete(self.speak_text_edge(text, voice))
-                    loop.close()
-                    return audio_data
-                    
-                elif engine == 'pyttsx3':
-                    return self.speak_text_pyttsx3(text)
-                    
-                elif engine == 'gtts':
-                    return self.speak_text_gtts(text)
-                    
-                elif engine in ['windows-sapi', 'macos-say', 'linux-espeak']:
-                    return self.speak_text_system(text)
+                audio_data = self.synthesize(engine, text, voice)
+                if not audio_data:
+                    raise Exception("no audio produced")
+                self.scheduler.record(engine, True, time.perf_counter() - started)
+                tts_cache.set(tts_cache.make_key(engine, voice, text), audio_data)
+                return audio_data, engine, False
                     
+            except TTSBusyError as e:
+                # Busy, not broken: try the next engine without counting it against this one
+                print(f"⚠️ {engine} busy: {e}")
+                continue
             except Exception as e:
+                self.scheduler.record(engine, False)
                 print(f"⚠️ {engine} failed: {e}")
                 continue
         
         raise Exception("All TTS engines failed")
+    
+    def generate_speech(self, text, voice="en-US-JennyNeural"):
+        """Generate speech using the best available method"""
+        return self.generate_speech_info(text, voice)[0]
+    
+    def stream_speech(self, text, voice="en-US-JennyNeural"):
+        """Return (mime_type, iterator of audio chunks) for chunked HTTP responses
+
+        Cached audio is sent at once. When Edge TTS is the scheduler's first choice its
+        chunks are relayed from the background loop as they arrive (and cached when
+        complete); other engines synthesize the whole clip first.
+        """
+        if not text or not text.strip():
+            raise Exception("No text provided")
+        
+        audio_data, _ = self.cached_speech(text, voice)
+        if audio_data:
+            return audio_mime_type(audio_data), iter([audio_data])
+        
+        exclude = ()
+        order = self.scheduler.order()
+        if order[:1] == ['edge-tts']:
+            started = time.perf_counter()
+            chunks = background_loop.iterate(self.stream_text_edge(text, voice), timeout=Config.TTS_TIMEOUT)
+            try:
+                # Wait for the first chunk so a failing engine can still fall back
+                first = next(chunks)
+                return 'audio/mpeg', self._relay_and_cache(chunks, first, 'edge-tts', voice, text, started)
+            except Exception as e:
+                chunks.close()
+                self.scheduler.record('edge-tts', False)
+                print(f"⚠️ edge-tts streaming failed: {e}")
+                exclude = ('edge-tts',)
+        
+        audio_data, _, _ = self.generate_speech_info(text, voice, exclude=exclude, order=order)
+        return audio_mime_type(audio_data), iter([audio_data])
+    
+    def _relay_and_cache(self, chunks, first, engine, voice, text, started):
+        """Yield streamed chunks; cache the full clip and record the full-stream time once it completes"""
+        parts = [first]
+        try:
+            yield first
+            try:
+                for chunk in chunks:
+                    parts.append(chunk)
+                    yield chunk
+            except Exception as e:
+                self.scheduler.record(engine, False)
+                print(f"⚠️ {engine} stream broke off: {e}")
+                raise
+            self.scheduler.record(engine, True, time.perf_counter() - started)
+            tts_cache.set(tts_cache.make_key(engine, voice, text), b"".join(parts))
+        finally:
+            chunks.close()
+    
+    def _executor(self):
+        """Shared thread pool for sentence-parallel synthesis (created on first use)"""
+        with self._executor_lock:
+            if self._sentence_executor is None:
+                self._sentence_executor = ThreadPoolExecutor(max_workers=Config.TTS_SENTENCE_WORKERS,
+                                                             thread_name_prefix="tts-sentence")
+            return self._sentence_executor
+    
+    def stream_sentences(self, text, voice="en-US-JennyNeural"):
+        """Synthesize each sentence concurrently; yields segment dicts in sentence order
+
+        Each segment is {'index', 'count', 'text', 'audio', 'engine', 'cached'} or, if
+        every engine failed for that sentence, {'index', 'count', 'text', 'error'}.
+        Sentences are cached individually, so stock phrases are reused across texts.
+        Edge TTS requests overlap on the background loop and offline engines on their
+        worker pool; the first segment is ready as soon as the first sentence is.
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            raise Exception("No text provided")
+        
+        executor = self._executor()
+        futures = [executor.submit(self.generate_speech_info, sentence, voice) for sentence in sentences]
+        try:
+            for index, (sentence, future) in enumerate(zip(sentences, futures)):
+                segment = {'index': index, 'count': len(sentences), 'text': sentence}
+                try:
+                    audio_data, engine, cached = future.result(Config.TTS_TIMEOUT * 2)
+                    segment.update({'audio': audio_data, 'engine': engine, 'cached': cached})
+                except Exception as e:
+                    print(f"⚠️ Sentence {index + 1}/{len(sentences)} failed: {e}")
+                    segment['error'] = str(e)
+                yield segment
+        finally:
+            # The client went away: don't synthesize sentences nobody will hear
+            for future in futures:
+                future.cancel()
+    
+    def presynthesize(self, texts, voice="en-US-JennyNeural"):
+        """Render texts into the cache ahead of time; returns how many segments were synthesized
+
+        Multi-sentence texts are cached per sentence, matching how the interview page
+        requests them (see stream_sentences).
+        """
+        synthesized = 0
+        segments = []
+        for text in texts:
+            if text and text.strip():
+                segments.extend(split_sentences(text))
+        for text in segments:
+            if self.cached_speech_available(text, voice):
+                continue
+            try:
+                self.generate_speech_info(text, voice)
+                synthesized += 1
+            except Exception as e:
+                print(f"⚠️ Pre-synthesis failed for '{text[:40]}': {e}")
+        return synthesized
+    
+    def cached_speech_available(self, text, voice="en-US-JennyNeural"):
+        """True if any engine's audio for this text is cached"""
+        return any(tts_cache.contains(tts_cache.make_key(engine, voice, text))
+                   for engine in self.available_engines)
 
 # Global TTS instance
 tts_engine = TextToSpeech()
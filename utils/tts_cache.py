@@ -0,0 +1,214 @@
+# Cache for synthesized speech (in-memory LRU bounded by bytes + optional disk tier)
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from config import Config
+
+
+class TTSCache:
+    """Audio keyed on a hash of (engine, voice, text)
+
+    The memory tier holds at most max_bytes of audio; the disk tier keeps one file per
+    entry under `folder` (created on first write) so questions synthesized before a
+    restart stay cached, and evicts the least recently used files beyond disk_max_bytes.
+    """
+
+    def __init__(self, max_bytes=None, folder=None, enabled=None, disk_max_bytes=None):
+        self.enabled = Config.TTS_CACHE_ENABLED if enabled is None else enabled
+        self.max_bytes = max_bytes if max_bytes is not None else Config.TTS_CACHE_MAX_BYTES
+        self.folder = folder if folder is not None else Config.TTS_CACHE_DIR
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else Config.TTS_CACHE_DISK_MAX_BYTES
+
+        self._memory = OrderedDict()  # key -> audio bytes
+        self._memory_bytes = 0
+        self._disk = None  # key -> file size, least recently used first (loaded on first disk access)
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'disk_evictions': 0,
+        }
+
+    @staticmethod
+    def make_key(engine, voice, text):
+        """Stable SHA-256 over the synthesis inputs"""
+        material = json.dumps([engine, voice or "", text], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return cached audio or None"""
+        return self.get_first([key])[1]
+
+    def get_first(self, keys):
+        """(key, audio) for the first cached key in order, or (None, None); one lookup in the stats"""
+        if not self.enabled:
+            return None, None
+
+        with self._lock:
+            for key in keys:
+                audio = self._memory.get(key)
+                if audio is not None:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return key, audio
+
+        for key in keys:
+            audio = self._disk_get(key)
+            if audio is not None:
+                self._memory_set(key, audio)
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                return key, audio
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None, None
+
+    def contains(self, key):
+        """True if either tier has the entry (does not count as a lookup)"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if key in self._memory:
+                return True
+        if not self._disk_ready():
+            return False
+        with self._disk_lock:
+            return key in self._disk
+
+    def set(self, key, audio):
+        """Store audio in both tiers"""
+        if not self.enabled or not audio:
+            return
+        self._memory_set(key, audio)
+        self._disk_set(key, audio)
+        with self._lock:
+            self._stats['stores'] += 1
+
+    def _memory_set(self, key, audio):
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = audio
+            self._memory_bytes += len(audio)
+            while self._memory_bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self._stats['evictions'] += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.folder, f"{key}.audio")
+
+    def _disk_ready(self):
+        """Create the folder and index existing files on first use; False if there is no disk tier"""
+        if not self.folder:
+            return False
+        with self._disk_lock:
+            if self._disk is not None:
+                return True
+            try:
+                os.makedirs(self.folder, exist_ok=True)
+                files = []
+                for entry in os.scandir(self.folder):
+                    if entry.name.endswith(".audio"):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, entry.name[:-len(".audio")], stat.st_size))
+            except OSError as e:
+                print(f"⚠️ TTS disk cache disabled: {e}")
+                self.folder = ""
+                return False
+            self._disk = OrderedDict((key, size) for _, key, size in sorted(files))
+            self._disk_bytes = sum(self._disk.values())
+        self._disk_evict()
+        return True
+
+    def _disk_get(self, key):
+        if not self._disk_ready():
+            return None
+        with self._disk_lock:
+            if key not in self._disk:
+                return None
+            self._disk.move_to_end(key)
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                audio = f.read()
+            os.utime(path)  # keeps the eviction order across restarts
+            return audio
+        except FileNotFoundError:
+            self._disk_forget(key)
+            return None
+        except OSError as e:
+            print(f"⚠️ TTS disk cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key, audio):
+        if len(audio) > self.disk_max_bytes or not self._disk_ready():
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio)
+            os.replace(temp_path, self._disk_path(key))
+        except OSError as e:
+            print(f"⚠️ TTS disk cache write failed: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self._disk_lock:
+            self._disk_bytes += len(audio) - self._disk.pop(key, 0)
+            self._disk[key] = len(audio)
+        self._disk_evict()
+
+    def _disk_forget(self, key):
+        with self._disk_lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+
+    def _disk_evict(self):
+        """Delete least recently used files until the disk tier fits its budget"""
+        while True:
+            with self._disk_lock:
+                if self._disk_bytes <= self.disk_max_bytes or not self._disk:
+                    return
+                key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+            try:
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ TTS disk cache eviction failed: {e}")
+            with self._lock:
+                self._stats['disk_evictions'] += 1
+
+    def get_stats(self):
+        """Hit/miss counters and memory use"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['memory_bytes'] = self._memory_bytes
+        with self._disk_lock:
+            stats['disk_entries'] = len(self._disk) if self._disk is not None else 0
+            stats['disk_bytes'] = self._disk_bytes
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        stats['enabled'] = self.enabled
+        stats['disk_tier'] = bool(self.folder)
+        return stats
+
+
+# Global TTS audio cache
+tts_cache = TTSCache()
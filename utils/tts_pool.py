@@ -0,0 +1,170 @@
+# Worker pool for offline TTS (pyttsx3 and espeak) so synthesis scales with cores
+import os
+import platform
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+from config import Config
+from utils.safe_threading import thread_manager
+
+
+class TTSBusyError(Exception):
+    """Raised when the offline TTS queue is full; load shedding, not an engine fault"""
+
+
+class OfflineTTSPool:
+    """One worker thread per core, each owning a warm pyttsx3 engine
+
+    pyttsx3 engines are created once per worker (on the worker's own thread, as the
+    drivers require) with rate, volume and voice already set, and render into a scratch
+    WAV file the worker reuses. espeak runs as `espeak --stdout` with the text on stdin
+    and the WAV read straight from the pipe, so no temp files are involved.
+
+    On Linux pyttsx3 drives the process-global libespeak, which routes its synth callback
+    to whichever driver registered last, so there is a single pyttsx3 engine on its own
+    worker; the parallelism there comes from the espeak subprocesses.
+    """
+
+    def __init__(self, num_workers=None, max_pending=None):
+        self.num_workers = num_workers or Config.TTS_OFFLINE_WORKERS or os.cpu_count() or 1
+        self.espeak_path = shutil.which("espeak") or shutil.which("espeak-ng")
+        max_pending = max_pending or Config.TTS_OFFLINE_QUEUE_SIZE
+        self._queue = queue.Queue(maxsize=max_pending)
+        # Linux: pyttsx3 jobs go to one dedicated worker instead of the shared queue
+        self._pyttsx3_queue = queue.Queue(maxsize=max_pending) if platform.system() == "Linux" else None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._workers = []
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                       'engines_created': 0, 'total_seconds': 0.0}
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._start_lock:
+            if self._workers:
+                return
+            for index in range(self.num_workers):
+                self._workers.append(thread_manager.start_thread(self._worker_loop, args=(self._queue,)))
+            if self._pyttsx3_queue is not None:
+                self._workers.append(thread_manager.start_thread(self._worker_loop, args=(self._pyttsx3_queue,)))
+            print(f"✅ Offline TTS pool started with {len(self._workers)} workers")
+
+    def submit(self, engine, text):
+        """Queue text for 'pyttsx3' or 'espeak'; returns a Future of the WAV bytes
+
+        Raises TTSBusyError when the queue is full.
+        """
+        self.start()
+        future = Future()
+        jobs = self._pyttsx3_queue if engine == 'pyttsx3' and self._pyttsx3_queue is not None else self._queue
+        try:
+            jobs.put_nowait((engine, text, future))
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['rejected'] += 1
+            raise TTSBusyError("Offline TTS queue is full")
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+        return future
+
+    def synthesize(self, engine, text, timeout=None):
+        """Submit and wait for the audio"""
+        timeout = timeout if timeout is not None else Config.TTS_TIMEOUT
+        return self.submit(engine, text).result(timeout)
+
+    def _worker_loop(self, jobs):
+        """Serve jobs from one queue with this worker's own engine until shutdown"""
+        state = {'engine': None, 'scratch': None}
+        try:
+            while not thread_manager.is_shutdown_requested():
+                try:
+                    engine, text, future = jobs.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                try:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    started = time.perf_counter()
+                    try:
+                        if engine == 'pyttsx3':
+                            audio_data = self._run_pyttsx3(state, text)
+                        elif engine == 'espeak':
+                            audio_data = self._run_espeak(text)
+                        else:
+                            raise ValueError(f"Unknown offline TTS engine: {engine}")
+                        future.set_result(audio_data)
+                        failed = False
+                    except Exception as e:
+                        future.set_exception(e)
+                        failed = True
+                    with self._stats_lock:
+                        self._stats['failed' if failed else 'completed'] += 1
+                        self._stats['total_seconds'] += time.perf_counter() - started
+                finally:
+                    jobs.task_done()
+        finally:
+            if state['scratch'] and os.path.exists(state['scratch']):
+                os.remove(state['scratch'])
+
+    def _create_pyttsx3(self):
+        """A warm pyttsx3 engine with rate, volume and a female voice when available"""
+        import pyttsx3
+
+        if platform.system() == "Windows":
+            try:
+                import pythoncom
+                pythoncom.CoInitialize()  # SAPI is COM; each worker thread needs its own apartment
+            except ImportError:
+                pass
+
+        # pyttsx3.init() hands every caller the same cached engine; each worker needs its own
+        engine = pyttsx3.Engine()
+        engine.setProperty('rate', 150)    # Speed
+        engine.setProperty('volume', 0.8)  # Volume
+        for voice in engine.getProperty('voices'):
+            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                engine.setProperty('voice', voice.id)
+                break
+        with self._stats_lock:
+            self._stats['engines_created'] += 1
+        return engine
+
+    def _run_pyttsx3(self, state, text):
+        if state['engine'] is None:
+            state['engine'] = self._create_pyttsx3()
+            fd, state['scratch'] = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+
+        state['engine'].save_to_file(text, state['scratch'])
+        state['engine'].runAndWait()
+        with open(state['scratch'], 'rb') as f:
+            return f.read()
+
+    def _run_espeak(self, text):
+        if not self.espeak_path:
+            raise RuntimeError("espeak is not installed")
+        result = subprocess.run([self.espeak_path, "--stdout"], input=text.encode("utf-8"),
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                timeout=Config.TTS_TIMEOUT)
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(result.stderr.decode(errors='ignore').strip()[:200] or "espeak produced no audio")
+        return result.stdout
+
+    def get_stats(self):
+        """Queue depth and throughput counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        finished = stats['completed'] + stats['failed']
+        stats['avg_seconds'] = round(stats.pop('total_seconds') / finished, 3) if finished else 0.0
+        stats['queued'] = self._queue.qsize() + (self._pyttsx3_queue.qsize() if self._pyttsx3_queue else 0)
+        stats['workers'] = len(self._workers) or self.num_workers
+        return stats
+
+
+# Global offline TTS pool
+tts_pool = OfflineTTSPool()
@@ -0,0 +1,130 @@
+# Health-aware ordering of TTS engines (latency tracking + circuit breakers)
+import math
+import threading
+import time
+from collections import deque
+
+from config import Config
+
+
+def _percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class EngineScheduler:
+    """Decides which TTS engine to try first
+
+    Each engine keeps its recent successful latencies and its consecutive failures.
+    After `failure_threshold` failures in a row its breaker opens and the engine is
+    skipped for `cooldown` seconds; the next call after that is a trial that closes
+    the breaker on success or reopens it on failure.
+
+    Healthy engines are ordered by p50 latency plus `preference_penalty` seconds per
+    position in the static (quality) order, so a better-sounding engine keeps its place
+    unless it is clearly slower. An engine on trial (no latency samples yet, or its breaker
+    just reopened) is put in its static-order slot for one call, so it gets a chance to
+    prove itself instead of queueing behind engines that keep succeeding. Until that call
+    is recorded (or `trial_timeout` passes) it ranks after the measured engines.
+    """
+
+    def __init__(self, engines, window=None, failure_threshold=None, cooldown=None, preference_penalty=None,
+                 trial_timeout=None):
+        self.engines = list(engines)
+        self.window = window or Config.TTS_STATS_WINDOW
+        self.failure_threshold = max(1, failure_threshold or Config.TTS_BREAKER_FAILURES)
+        self.cooldown = cooldown if cooldown is not None else Config.TTS_BREAKER_COOLDOWN
+        self.preference_penalty = (preference_penalty if preference_penalty is not None
+                                   else Config.TTS_PREFERENCE_PENALTY)
+        self.trial_timeout = trial_timeout if trial_timeout is not None else Config.TTS_TIMEOUT
+        self._lock = threading.Lock()
+        self._state = {
+            engine: {'latencies': deque(maxlen=self.window), 'successes': 0, 'failures': 0,
+                     'consecutive_failures': 0, 'open_until': 0.0, 'trips': 0,
+                     'trial_until': 0.0}
+            for engine in self.engines
+        }
+
+    def _on_trial(self, state, now):
+        """Unmeasured, or cooled down after a trip and not yet proven healthy again"""
+        return not state['latencies'] or 0 < state['open_until'] <= now
+
+    def order(self, engines=None, claim=True):
+        """Engines to try, best first; open breakers go last (soonest to reopen first)
+
+        With claim=True a trial slot handed out here is reserved for this caller; pass
+        claim=False to only look at the order (e.g. for stats).
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [e for e in (engines or self.engines) if e in self._state]
+            healthy = [e for e in candidates if self._state[e]['open_until'] <= now]
+            trials = [e for e in healthy
+                      if self._on_trial(self._state[e], now) and self._state[e]['trial_until'] <= now]
+            measured = [e for e in healthy if e not in trials and self._state[e]['latencies']]
+            waiting = [e for e in healthy if e not in trials and not self._state[e]['latencies']]
+            measured.sort(key=lambda e: _percentile(self._state[e]['latencies'], 0.5)
+                          + self.preference_penalty * self.engines.index(e))
+            ranked = measured + waiting
+            for engine in trials:
+                # Ahead of every engine that is lower in the static order
+                rank = self.engines.index(engine)
+                slot = next((i for i, other in enumerate(ranked) if self.engines.index(other) > rank), len(ranked))
+                ranked.insert(slot, engine)
+                if claim:
+                    self._state[engine]['trial_until'] = now + self.trial_timeout
+            tripped = sorted((e for e in candidates if self._state[e]['open_until'] > now),
+                             key=lambda e: self._state[e]['open_until'])
+        return ranked + tripped
+
+    def is_open(self, engine):
+        with self._lock:
+            return self._state[engine]['open_until'] > time.time()
+
+    def record(self, engine, success, seconds=None):
+        """Record one attempt; seconds (successes only) feeds the latency percentiles"""
+        with self._lock:
+            state = self._state.get(engine)
+            if state is None:
+                return
+            state['trial_until'] = 0.0
+            if success:
+                state['successes'] += 1
+                state['consecutive_failures'] = 0
+                state['open_until'] = 0.0
+                if seconds is not None:
+                    state['latencies'].append(seconds)
+                return
+            state['failures'] += 1
+            state['consecutive_failures'] += 1
+            if state['consecutive_failures'] >= self.failure_threshold:
+                state['open_until'] = time.time() + self.cooldown
+                state['trips'] += 1
+                tripped = True
+            else:
+                tripped = False
+        if tripped:
+            print(f"⚠️ TTS engine '{engine}' failing, skipping it for {self.cooldown:.0f}s")
+
+    def get_stats(self):
+        """Per-engine success rate, latency percentiles and breaker state"""
+        now = time.time()
+        stats = {}
+        with self._lock:
+            for engine in self.engines:
+                state = self._state[engine]
+                attempts = state['successes'] + state['failures']
+                latencies = list(state['latencies'])
+                stats[engine] = {
+                    'breaker': 'open' if state['open_until'] > now else 'closed',
+                    'reopens_in': round(max(0.0, state['open_until'] - now), 1),
+                    'successes': state['successes'],
+                    'failures': state['failures'],
+                    'success_rate': round(state['successes'] / attempts, 3) if attempts else None,
+                    'consecutive_failures': state['consecutive_failures'],
+                    'trips': state['trips'],
+                    'p50_seconds': round(_percentile(latencies, 0.5), 3) if latencies else None,
+                    'p95_seconds': round(_percentile(latencies, 0.95), 3) if latencies else None,
+                }
+        return {'order': self.order(claim=False), 'engines': stats}